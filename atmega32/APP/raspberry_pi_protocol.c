@@ -164,9 +164,7 @@ static void Protocol_ProcessCommand(u8 cmd, const u8* data, u8 length) {
             break;
             
         case CMD_ALL_SENSORS_REQUEST:
-            Handle_IMURequest();
-            _delay_ms(10);
-            Handle_UltrasonicRequest();
+            Handle_AllSensorsRequest();
             break;
             
         case CMD_SYSTEM_STATUS:
@@ -248,6 +246,10 @@ void Protocol_SendUltrasonicData(const Ultrasonic_Data_t* ultrasonic) {
     Protocol_SendPacket(RESP_ULTRASONIC_DATA, (const u8*)ultrasonic, sizeof(Ultrasonic_Data_t));
 }
 
+void Protocol_SendAllSensorsData(const All_Sensors_Data_t* sensors) {
+    Protocol_SendPacket(RESP_ALL_SENSORS_DATA, (const u8*)sensors, sizeof(All_Sensors_Data_t));
+}
+
 void Protocol_SendSystemStatus(const System_Status_t* status) {
     Protocol_SendPacket(RESP_SYSTEM_STATUS, (const u8*)status, sizeof(System_Status_t));
 }
@@ -291,7 +293,7 @@ void Handle_EmergencyStop(void) {
     LED_ON(RED_LED_PIN);
 }
 
-void Handle_IMURequest(void) {
+static void Read_IMU(void) {
     // Read MPU9250 (accelerometer + gyroscope + magnetometer)
     MPU9250_Data_t mpu_data;
     MPU9250_InitData(&mpu_data);
@@ -315,12 +317,9 @@ void Handle_IMURequest(void) {
     current_imu.roll = mpu_data.roll;
     current_imu.pitch = mpu_data.pitch;
     current_imu.yaw = mpu_data.yaw;
-    
-    // Send to Raspberry Pi
-    Protocol_SendIMUData(&current_imu);
 }
 
-void Handle_UltrasonicRequest(void) {
+static void Read_Ultrasonic(void) {
     // Read all 4 ultrasonic sensors
     f32 distance;
     
@@ -345,11 +344,34 @@ void Handle_UltrasonicRequest(void) {
     // Right sensor
     ULTRAS_Read(&distance, ULTRASONIC4_TRIG_PIN);
     current_ultrasonic.right = (distance >= 0) ? distance : 400.0;
+}
+
+void Handle_IMURequest(void) {
+    Read_IMU();
+    
+    // Send to Raspberry Pi
+    Protocol_SendIMUData(&current_imu);
+}
+
+void Handle_UltrasonicRequest(void) {
+    Read_Ultrasonic();
     
     // Send to Raspberry Pi
     Protocol_SendUltrasonicData(&current_ultrasonic);
 }
 
+void Handle_AllSensorsRequest(void) {
+    All_Sensors_Data_t sensors;
+    
+    Read_IMU();
+    Read_Ultrasonic();
+    
+    // One packet instead of two back-to-back replies
+    sensors.imu = current_imu;
+    sensors.ultrasonic = current_ultrasonic;
+    Protocol_SendAllSensorsData(&sensors);
+}
+
 void Handle_SystemStatusRequest(void) {
     // Update system status
     system_status.uptime = system_uptime;
@@ -98,6 +98,15 @@ typedef struct {
     float right;    // Distance in cm
 } __attribute__((packed)) Ultrasonic_Data_t;
 
+/**
+ * Combined reply to CMD_ALL_SENSORS_REQUEST
+ * Size: 64 bytes (IMU followed by ultrasonic, fits MAX_DATA_LENGTH)
+ */
+typedef struct {
+    IMU_Data_t imu;
+    Ultrasonic_Data_t ultrasonic;
+} __attribute__((packed)) All_Sensors_Data_t;
+
 /**
  * System status
  * Size: 10 bytes
@@ -160,6 +169,11 @@ void Protocol_SendIMUData(const IMU_Data_t* imu);
  */
 void Protocol_SendUltrasonicData(const Ultrasonic_Data_t* ultrasonic);
 
+/**
+ * Send IMU and ultrasonic data to Raspberry Pi in a single packet
+ */
+void Protocol_SendAllSensorsData(const All_Sensors_Data_t* sensors);
+
 /**
  * Send system status to Raspberry Pi
  */
@@ -209,6 +223,13 @@ extern void Handle_IMURequest(void);
  */
 extern void Handle_UltrasonicRequest(void);
 
+/**
+ * Handle combined sensor request
+ * Called when CMD_ALL_SENSORS_REQUEST is received
+ * Should call Protocol_SendAllSensorsData() once with both readings
+ */
+extern void Handle_AllSensorsRequest(void);
+
 /**
  * Handle system status request
  * Called when CMD_SYSTEM_STATUS is received
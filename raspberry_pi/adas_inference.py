@@ -19,6 +19,11 @@ import sys
 import subprocess
 import signal
 import atexit
+import threading
+import functools
+import hashlib
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Suppress ONNX Runtime warnings about CUDA
 import os
@@ -105,6 +110,49 @@ SIGN_CLASSES = {
 
 # ==================== KINECT CAMERA INTERFACE ====================
 
+DEPTH_SCALE = 0.001      # Kinect depth units (mm) -> meters
+DEPTH_MAX_MM = 10000     # Readings at or beyond this are treated as invalid
+DEPTH_ROI_STRIDE = 2     # Sample every Nth row/column of a bbox for its median (N^2 fewer pixels)
+DEPTH_ROI_MIN_SIDE = 16  # Boxes narrower/shorter than this (px) are sampled at full resolution
+KINECT_RETRY_DELAY = 0.05     # First back-off (s) after a failed Kinect read
+KINECT_MAX_RETRY_DELAY = 0.5  # Back-off cap (s) while the Kinect keeps failing
+
+def _roi_median(roi: np.ndarray, upper: float) -> float:
+    """Median of the valid (0 < d < upper) readings of a depth ROI, -1.0 if none"""
+    if roi.size == 0:
+        return -1.0
+
+    # 3x3 median filter removes the Kinect's salt-and-pepper speckle
+    if roi.shape[0] >= 3 and roi.shape[1] >= 3:
+        roi = cv2.medianBlur(np.ascontiguousarray(roi), 3)
+
+    valid_depths = roi[(roi > 0) & (roi < upper)]
+    if valid_depths.size == 0:
+        return -1.0
+
+    # Quickselect (O(n)) instead of the full sort done by np.median
+    k = valid_depths.size // 2
+    return float(np.partition(valid_depths, k)[k])
+
+def bbox_distances(depth: np.ndarray, boxes: np.ndarray, upper: float = np.inf) -> np.ndarray:
+    """Median depth inside each (x1, y1, x2, y2) row of boxes (-1.0 where nothing valid)"""
+    h, w = depth.shape[:2]
+    boxes = np.array(boxes, dtype=np.int32).reshape(-1, 4)
+    np.clip(boxes[:, 0::2], 0, w - 1, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, h - 1, out=boxes[:, 1::2])
+    medians = []
+    for x1, y1, x2, y2 in boxes.tolist():
+        # Kinect depth is smooth, so a strided subsample keeps the median within a few mm
+        step = DEPTH_ROI_STRIDE if min(x2 - x1, y2 - y1) >= DEPTH_ROI_MIN_SIDE else 1
+        medians.append(_roi_median(depth[y1:y2:step, x1:x2:step], upper))
+    return np.array(medians, dtype=np.float64)
+
+def bbox_distance(depth_meters: np.ndarray, bbox: Tuple[int, int, int, int]) -> float:
+    """Median distance (m) inside bbox of a depth map prepared by KinectCamera.depth_to_meters"""
+    if depth_meters is None:
+        return -1.0
+    return float(bbox_distances(depth_meters, [bbox])[0])
+
 class KinectCamera:
     """Robust Kinect v1 (libfreenect) wrapper using the sync API.
     - Retries on failure.
@@ -170,6 +218,11 @@ class KinectCamera:
             logger.error("Kinect initialization failed after retries.")
             logger.info("Falling back to standard camera...")
 
+        # Background capture (see start_capture); holds only the newest frame pair
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._capture_thread = None
+        self._capture_running = False
+
     def get_frame(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """Return (rgb_frame, depth_frame). If not connected, returns (None, None)."""
         if not self.connected:
@@ -184,9 +237,12 @@ class KinectCamera:
                 return None, None
 
             rgb_frame = rgb_result[0]
-            # convert if necessary
+            # convert if necessary; freenect hands us a fresh array, so swap channels in place
             try:
-                rgb_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+                if rgb_frame.flags.writeable and rgb_frame.flags.c_contiguous:
+                    cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR, dst=rgb_frame)
+                else:
+                    rgb_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
             except Exception:
                 pass
 
@@ -205,25 +261,79 @@ class KinectCamera:
         """Same as before; safe on None depth."""
         if depth_frame is None:
             return -1.0
+        return float(self.get_bbox_distances_batch(depth_frame, [bbox])[0])
 
-        x1, y1, x2, y2 = bbox
-        x1 = max(0, min(x1, depth_frame.shape[1] - 1))
-        x2 = max(0, min(x2, depth_frame.shape[1] - 1))
-        y1 = max(0, min(y1, depth_frame.shape[0] - 1))
-        y2 = max(0, min(y2, depth_frame.shape[0] - 1))
+    def get_bbox_distances_batch(self, depth_frame: np.ndarray, bboxes: np.ndarray) -> np.ndarray:
+        """Distances (m) for an (N, 4) array of x1, y1, x2, y2 boxes in one call (-1.0 if unknown)"""
+        if depth_frame is None:
+            return np.full(len(bboxes), -1.0)
+        medians_mm = bbox_distances(depth_frame, bboxes, DEPTH_MAX_MM)
+        return np.where(medians_mm > 0, medians_mm * DEPTH_SCALE, -1.0)
 
-        roi = depth_frame[y1:y2, x1:x2]
-        if roi.size == 0:
-            return -1.0
+    @staticmethod
+    def depth_to_meters(depth_frame: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        """Convert a raw depth frame to contiguous float32 meters (invalid pixels = 0).
 
-        valid_depths = roi[(roi > 0) & (roi < 10000)]
-        if len(valid_depths) == 0:
-            return -1.0
+        Done once per frame so every detector shares the same converted map
+        instead of re-masking the raw frame for each bounding box.
+        """
+        if depth_frame is None:
+            return None
+
+        depth_meters = np.ascontiguousarray(depth_frame, dtype=np.float32)
+        if depth_meters is depth_frame:
+            depth_meters = depth_meters.copy()
+        depth_meters[depth_meters >= DEPTH_MAX_MM] = 0.0
+        depth_meters *= DEPTH_SCALE
+        return depth_meters
+
+    def start_capture(self):
+        """Grab frames on a background thread so USB transfers overlap inference"""
+        if not self.connected or self._capture_thread is not None:
+            return
+        self._capture_running = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+        logger.info("Kinect capture thread started")
 
-        return float(np.median(valid_depths) / 1000.0)
+    def _capture_loop(self):
+        """Publish the latest (bgr, depth) pair, dropping any frame not yet consumed"""
+        retry_delay = KINECT_RETRY_DELAY
+        while self._capture_running:
+            frames = self.get_frame()
+            if frames[0] is None:
+                # Transient USB read failure: keep the last good frame queued and
+                # retry (backing off while the device stays unavailable)
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, KINECT_MAX_RETRY_DELAY)
+                continue
+            retry_delay = KINECT_RETRY_DELAY
+            try:
+                self._frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._frame_queue.put_nowait(frames)
+        # freenect's sync loop is owned by this thread, so stop it here
+        try:
+            freenect.sync_stop()
+        except Exception:
+            pass
+
+    def get_latest_frame(self, timeout: float = 1.0) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Return the newest frame pair from the capture thread ((None, None) on timeout)"""
+        try:
+            return self._frame_queue.get(timeout=timeout)
+        except queue.Empty:
+            logger.warning("No frame from Kinect capture thread")
+            return None, None
 
     def release(self):
         """Stop any freenect sync loops gracefully."""
+        if self._capture_thread is not None:
+            self._capture_running = False
+            self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
+            return
         try:
             freenect.sync_stop()
         except Exception:
@@ -232,23 +342,103 @@ class KinectCamera:
 
 # ==================== BASE ONNX MODEL CLASS ====================
 
+# Tried in order; XNNPACK has NEON int8/fp32 kernels for the Pi 5's Cortex-A76
+PREFERRED_PROVIDERS = ['XnnpackExecutionProvider', 'CPUExecutionProvider']
+
+# ONNX output element types that can be preallocated as numpy buffers
+_ORT_TENSOR_TYPES = {
+    'tensor(float)': np.float32,
+    'tensor(float16)': np.float16,
+    'tensor(double)': np.float64,
+    'tensor(int64)': np.int64,
+    'tensor(int32)': np.int32,
+    'tensor(uint8)': np.uint8,
+    'tensor(bool)': np.bool_,
+}
+
+_shared_allocator_registered = False
+
+def register_shared_allocator() -> bool:
+    """Register one CPU arena on the ORT environment so all sessions reuse its blocks"""
+    global _shared_allocator_registered
+    if _shared_allocator_registered:
+        return True
+    try:
+        mem_info = ort.OrtMemoryInfo("Cpu", ort.OrtAllocatorType.ORT_ARENA_ALLOCATOR, 0, ort.OrtMemType.DEFAULT)
+        # 0 / -1 keep ORT's defaults for max memory, extend strategy, initial chunk and dead bytes
+        ort.create_and_register_allocator(mem_info, ort.OrtArenaCfg(0, -1, -1, -1))
+        _shared_allocator_registered = True
+    except Exception as e:
+        logger.warning(f"Shared ORT allocator unavailable ({e}) - using per-session arenas")
+    return _shared_allocator_registered
+
+def prefer_int8_model(model_path: str) -> str:
+    """Return the INT8 model produced by quantize_models.py if it exists"""
+    int8_path = os.path.splitext(model_path)[0] + '_int8.onnx'
+    if os.path.exists(int8_path):
+        logger.info(f"Using INT8 model: {int8_path}")
+        return int8_path
+    return model_path
+
 class ONNXModel:
     """Base class for ONNX model inference"""
     
-    def __init__(self, model_path: str, providers: List[str] = None):
+    def __init__(self, model_path: str, providers: List[str] = None, input_scale: float = 1.0,
+                 intra_op_threads: Optional[int] = None,
+                 graph_optimization_level: ort.GraphOptimizationLevel = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+                 disabled_optimizers: Optional[List[str]] = None):
+        """
+        Args:
+            model_path: Path to ONNX model
+            providers: ONNX Runtime execution providers
+            input_scale: Multiplier applied to 0-255 pixel values during preprocess
+            intra_op_threads: ORT intra-op thread count (default: all cores)
+            graph_optimization_level: ORT graph optimization level. EXTENDED skips the
+                NCHWc layout transforms of ENABLE_ALL, which can slow down some convs on ARM.
+            disabled_optimizers: ORT graph transformers to skip (e.g. ["ConvAddActivationFusion"])
+                if profiling shows a specific fusion regressing
+        """
+        self.input_scale = input_scale
         if providers is None:
-            # CPU-only optimization
-            providers = ['CPUExecutionProvider']
+            available = ort.get_available_providers()
+            providers = [p for p in PREFERRED_PROVIDERS if p in available]
         
         try:
             # Set session options for better CPU performance
             sess_options = ort.SessionOptions()
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-            sess_options.intra_op_num_threads = 4  # Use 4 CPU threads
-            sess_options.inter_op_num_threads = 2
-            sess_options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
             
-            self.session = ort.InferenceSession(model_path, sess_options=sess_options, providers=providers)
+            # Reuse the graph optimized on a previous start. The file name encodes the
+            # source model's size and mtime plus the settings that shaped it, so a
+            # replaced model or a different level, disabled_optimizers or provider list
+            # optimizes (and caches) afresh
+            optimized_path = self._optimized_model_path(model_path, graph_optimization_level,
+                                                        disabled_optimizers, providers)
+            if os.path.exists(optimized_path):
+                logger.info(f"Using cached optimized model: {optimized_path}")
+                model_path = optimized_path
+                sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            else:
+                sess_options.graph_optimization_level = graph_optimization_level
+                # ORT can only serialize graphs whose nodes all run on the CPU provider;
+                # with XNNPACK (or any other EP) session creation would fail instead
+                if (list(providers) == ['CPUExecutionProvider'] and
+                        os.access(os.path.dirname(os.path.abspath(model_path)), os.W_OK)):
+                    sess_options.optimized_model_filepath = optimized_path
+            
+            # Batch-1 CNNs gain nothing from inter-op parallelism; with three sessions
+            # per frame it only oversubscribes the Pi's 4 cores
+            sess_options.intra_op_num_threads = intra_op_threads or os.cpu_count() or 4
+            sess_options.inter_op_num_threads = 1
+            sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            sess_options.enable_cpu_mem_arena = True
+            # Don't busy-wait between the back-to-back runs in process_frame
+            sess_options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+            # Lane/object/sign sessions draw from one shared arena instead of three
+            if register_shared_allocator():
+                sess_options.add_session_config_entry("session.use_env_allocators", "1")
+            
+            self.session = ort.InferenceSession(model_path, sess_options=sess_options, providers=providers,
+                                                disabled_optimizers=disabled_optimizers or [])
             self.input_name = self.session.get_inputs()[0].name
             self.output_names = [output.name for output in self.session.get_outputs()]
             
@@ -278,23 +468,107 @@ class ONNXModel:
             logger.info(f"Input shape: {input_shape}")
             logger.info(f"Using input size: {self.input_width}x{self.input_height}")
             
+            self.frame_shape = None
+            self._blob = self._make_blob_fn()
+            
+            # Persistent input tensor: the OrtValue wraps _input_buffer without a copy,
+            # so inference() only memcpy's the new blob in and ORT reuses its arena
+            self._input_buffer = np.zeros((1, 3, self.input_height, self.input_width), dtype=np.float32)
+            self._input_ortvalue = ort.OrtValue.ortvalue_from_numpy(self._input_buffer)
+            self.io_binding = self.session.io_binding()
+            self.io_binding.bind_ortvalue_input(self.input_name, self._input_ortvalue)
+            # Static-shape outputs (the usual case for these detectors) go to reused
+            # buffers that ORT writes into directly; only if some output has a
+            # dynamic shape does ORT allocate (and inference copy) per run
+            self._output_buffers = self._allocate_outputs()
+            if self._output_buffers is not None:
+                for name, buffer in zip(self.output_names, self._output_buffers):
+                    self.io_binding.bind_ortvalue_output(name, ort.OrtValue.ortvalue_from_numpy(buffer))
+            else:
+                for name in self.output_names:
+                    self.io_binding.bind_output(name, 'cpu')
+            
         except Exception as e:
             logger.error(f"Failed to load model {model_path}: {e}")
             raise
     
+    def _allocate_outputs(self) -> Optional[List[np.ndarray]]:
+        """One buffer per output if every output has a static shape and known type, else None"""
+        buffers = []
+        for output in self.session.get_outputs():
+            dtype = _ORT_TENSOR_TYPES.get(output.type)
+            if dtype is None or not all(isinstance(dim, int) for dim in output.shape):
+                return None
+            buffers.append(np.empty(output.shape, dtype=dtype))
+        return buffers
+    
+    def specialize(self, frame_shape: tuple):
+        """Bake shape-dependent constants for a fixed camera resolution"""
+        self.frame_shape = tuple(frame_shape[:2])
+        self._blob = self._make_blob_fn()
+    
+    def _make_blob_fn(self):
+        """Bind blobFromImage to this model's input size and scale
+        
+        When the specialized frame is an integer multiple of the network input,
+        downscale first with INTER_AREA into a reused buffer: at integer ratios it
+        is a plain block average, about as fast as blobFromImage's bilinear resize
+        and alias-free. At fractional ratios INTER_AREA is several times slower,
+        so those keep the bilinear path.
+        """
+        size = (self.input_width, self.input_height)
+        blob = functools.partial(cv2.dnn.blobFromImage,
+                                 scalefactor=self.input_scale,
+                                 size=size,
+                                 swapRB=True, crop=False)
+        if self.frame_shape is None:
+            return blob
+        h, w = self.frame_shape
+        if (h <= self.input_height or w <= self.input_width
+                or h % self.input_height or w % self.input_width):
+            return blob
+        
+        resized = np.empty((self.input_height, self.input_width, 3), dtype=np.uint8)
+        
+        def area_blob(image: np.ndarray) -> np.ndarray:
+            return blob(cv2.resize(image, size, dst=resized, interpolation=cv2.INTER_AREA))
+        
+        return area_blob
+    
+    @staticmethod
+    def _optimized_model_path(model_path: str, level: ort.GraphOptimizationLevel,
+                              disabled_optimizers: Optional[List[str]], providers: List) -> str:
+        """<model>.<level>.<settings hash>.opt.onnx for the cached optimized graph"""
+        stat = os.stat(model_path)
+        settings = repr((stat.st_size, stat.st_mtime_ns,
+                         sorted(disabled_optimizers or []), list(providers)))
+        digest = hashlib.sha1(settings.encode()).hexdigest()[:8]
+        level_name = level.name.lower().replace('ort_', '')
+        return f"{os.path.splitext(model_path)[0]}.{level_name}.{digest}.opt.onnx"
+    
     def preprocess(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess image for model input"""
-        img = cv2.resize(image, (self.input_width, self.input_height))
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        # img = img.astype(np.float32) / 255.0
-        img = np.transpose(img, (2, 0, 1))
-        img = np.expand_dims(img, axis=0)
-        return img
+        """Preprocess image for model input
+        
+        Resize, BGR->RGB, scaling, HWC->CHW and the batch dimension are done in a
+        single OpenCV pass, producing a (1, 3, H, W) float32 blob.
+        """
+        return self._blob(image)
     
     def inference(self, preprocessed_input: np.ndarray) -> List[np.ndarray]:
-        """Run inference"""
-        outputs = self.session.run(self.output_names, {self.input_name: preprocessed_input})
-        return outputs
+        """Run inference
+        
+        With static output shapes the returned arrays are the model's reused output
+        buffers, overwritten by the next inference call.
+        """
+        if preprocessed_input.shape != self._input_buffer.shape:
+            # Unexpected shape (e.g. a custom preprocess) - use the unbound path
+            return self.session.run(self.output_names, {self.input_name: preprocessed_input})
+        
+        np.copyto(self._input_buffer, preprocessed_input, casting='unsafe')
+        self.session.run_with_iobinding(self.io_binding)
+        if self._output_buffers is not None:
+            return self._output_buffers
+        return self.io_binding.copy_outputs_to_cpu()
     
     def postprocess(self, outputs: List[np.ndarray], original_image: np.ndarray):
         """Postprocess model outputs - override in child classes"""
@@ -305,10 +579,11 @@ class ONNXModel:
 class LaneDetector(ONNXModel):
     """Lane detection using ONNX model (ENet/ENet-SAD/SCNN)"""
     
-    def __init__(self, model_path: str):
-        super().__init__(model_path)
+    def __init__(self, model_path: str, intra_op_threads: Optional[int] = None):
+        super().__init__(model_path, intra_op_threads=intra_op_threads)
         self.lane_history = []
         self.history_size = 5
+        self.sample_rows = 48  # Rows sampled per lane for scanning/fitting
         # Color map for lane classes (similar to 'jet' colormap)
         self.lane_colors = [
             (0, 0, 0),       # 0: Background
@@ -320,6 +595,11 @@ class LaneDetector(ONNXModel):
             (255, 255, 0),   # 6: Lane 6 (Cyan)
             (255, 255, 255)  # 7: Lane 7 (White)
         ]
+        
+        # Overlay LUT: class 1-7 -> jet color of (class - 1) * 255 // 6, background black
+        levels = np.array([(class_id - 1) * 255 // 6 for class_id in range(1, 8)], dtype=np.uint8)
+        self._lane_lut = np.zeros((256, 1, 3), dtype=np.uint8)
+        self._lane_lut[1:8, 0] = cv2.applyColorMap(levels.reshape(-1, 1), cv2.COLORMAP_JET).reshape(-1, 3)
     
     def postprocess(self, outputs: List[np.ndarray], original_image: np.ndarray) -> LaneResult:
         """Postprocess lane detection output"""
@@ -435,35 +715,30 @@ class LaneDetector(ONNXModel):
         # Scan from bottom to top to find left and right lane edges
         bottom_half_start = h // 2  # Focus on bottom half of image
         
-        left_points = []
-        right_points = []
         image_center_x = w / 2
         
-        # Scan each row from bottom to top
-        for y in range(h - 1, bottom_half_start, -5):  # Step by 5 for efficiency
-            row = lane_result[y, :]
-            lane_pixels = np.where(row > 0)[0]  # Find all lane pixels in this row
-            
-            if len(lane_pixels) == 0:
-                continue
-            
-            # Split pixels into left (< center) and right (> center)
-            left_pixels = lane_pixels[lane_pixels < image_center_x]
-            right_pixels = lane_pixels[lane_pixels > image_center_x]
-            
-            # Get rightmost left lane pixel and leftmost right lane pixel
-            if len(left_pixels) > 0:
-                left_points.append([left_pixels[-1], y])  # Rightmost left pixel
-            
-            if len(right_pixels) > 0:
-                right_points.append([right_pixels[0], y])  # Leftmost right pixel
+        # Scan rows from bottom to top (at most ~sample_rows rows), all rows at once
+        row_step = max(5, (h - 1 - bottom_half_start) // self.sample_rows)
+        ys = np.arange(h - 1, bottom_half_start, -row_step)
+        rows = lane_result[ys] > 0
+        
+        # Split columns into left (< center) and right (> center)
+        left_stop = int(np.ceil(image_center_x))
+        right_start = int(np.floor(image_center_x)) + 1
+        left_cols = rows[:, :left_stop]
+        right_cols = rows[:, right_start:]
         
-        # Convert to numpy arrays
-        if len(left_points) > 10:
-            left_lane = np.array(left_points)
+        # Rightmost left lane pixel and leftmost right lane pixel of each row
+        has_left = left_cols.any(axis=1)
+        has_right = right_cols.any(axis=1)
+        left_x = left_stop - 1 - np.argmax(left_cols[:, ::-1], axis=1)
+        right_x = right_start + np.argmax(right_cols, axis=1)
         
-        if len(right_points) > 10:
-            right_lane = np.array(right_points)
+        if np.count_nonzero(has_left) > 10:
+            left_lane = np.column_stack([left_x[has_left], ys[has_left]])
+        
+        if np.count_nonzero(has_right) > 10:
+            right_lane = np.column_stack([right_x[has_right], ys[has_right]])
         
         # Calculate lane center and departure
         if left_lane is not None and right_lane is not None:
@@ -523,35 +798,36 @@ class LaneDetector(ONNXModel):
                 if area < min_size:
                     continue  # Skip small components
                 
-                # Get all points in this component
-                component_mask = (labels == i).astype(np.uint8)
-                points = np.column_stack(np.where(component_mask > 0))  # (y, x) format
-                
-                if len(points) < 10:
-                    continue
-                
                 # Check if component extends toward bottom of image (lanes should)
-                max_y = points[:, 0].max()
+                max_y = stats[i, cv2.CC_STAT_TOP] + stats[i, cv2.CC_STAT_HEIGHT] - 1
                 if max_y < min_bottom_y:
                     continue  # Skip components that don't reach lower part of image
                 
-                # Convert to (x, y) format
-                y_coords = points[:, 0]
-                x_coords = points[:, 1]
+                # Get all points in this component as compact (x, y) int32 pairs;
+                # findNonZero scans row-major, so they are already sorted by y
+                component_mask = (labels == i).astype(np.uint8)
+                points = cv2.findNonZero(component_mask)
+                
+                if points is None or len(points) < 10:
+                    continue
+                
+                points = points.reshape(-1, 2)
+                x_coords = points[:, 0]
+                y_coords = points[:, 1]
                 
-                # Sort by y-coordinate (top to bottom)
-                sorted_indices = np.argsort(y_coords)
-                y_coords = y_coords[sorted_indices]
-                x_coords = x_coords[sorted_indices]
+                # A quadratic lane only needs a few dozen rows to fit and draw
+                y_min, y_max = y_coords[0], y_coords[-1]
+                row_step = max(1, (y_max - y_min + 1) // self.sample_rows)
+                sampled = (y_coords - y_min) % row_step == 0
                 
                 # Fit polynomial curve
                 try:
                     degree = 2  # Use 2 for gentle curves, 3 for more complex lanes
-                    coeffs = np.polyfit(y_coords, x_coords, degree)
+                    coeffs = np.polyfit(y_coords[sampled], x_coords[sampled], degree)
                     poly = np.poly1d(coeffs)
                     
-                    # Generate smooth curve points
-                    y_smooth = np.arange(y_coords.min(), y_coords.max() + 1)
+                    # Generate smooth curve points (polylines joins them into segments)
+                    y_smooth = np.append(np.arange(y_min, y_max, row_step), y_max)
                     x_smooth = poly(y_smooth).astype(np.int32)
                     
                     # Clip x coordinates to image bounds
@@ -567,29 +843,18 @@ class LaneDetector(ONNXModel):
         
         return refined_mask
     
-    def draw_lanes(self, image: np.ndarray, lane_result: LaneResult) -> np.ndarray:
-        """Draw detected lanes on image with segmentation overlay"""
-        overlay = image.copy()
+    def draw_lanes(self, image: np.ndarray, lane_result: LaneResult, inplace: bool = True) -> np.ndarray:
+        """Draw detected lanes on image with segmentation overlay (into image unless inplace=False)"""
+        overlay = image if inplace else image.copy()
         h, w = image.shape[:2]
         
-        lane_mask = lane_result.lane_mask
+        lane_mask = lane_result.lane_mask.astype(np.uint8)
 
-        # Normalize mask values from 1-7 to 0-255 for colormap application
-        mask_normalized = np.zeros_like(lane_mask, dtype=np.uint8)
-        mask_normalized[lane_mask > 0] = ((lane_mask[lane_mask > 0] - 1) * 255 // 6).astype(np.uint8)
-        
-        # Apply jet colormap
-        colored_mask = cv2.applyColorMap(mask_normalized, cv2.COLORMAP_JET)
-        
-        # Create binary mask for valid lane pixels (where lane_mask >= 1)
-        valid_mask = (lane_mask >= 1).astype(np.uint8)
-        valid_mask_3ch = np.stack([valid_mask] * 3, axis=-1)
-        
-        # Apply the colored mask only where valid lanes exist
-        colored_mask = colored_mask * valid_mask_3ch
+        # Jet-colored lanes on black background in a single lookup pass
+        colored_mask = cv2.LUT(cv2.merge([lane_mask] * 3), self._lane_lut)
         
         # Blend with original image (alpha=0.7)
-        overlay = cv2.addWeighted(overlay, 1.0, colored_mask, 0.7, 0)
+        cv2.addWeighted(overlay, 1.0, colored_mask, 0.7, 0, dst=overlay)
         
         # Draw lane departure indicator
         center_x = int(w / 2)
@@ -607,8 +872,9 @@ class LaneDetector(ONNXModel):
 class ObjectDetector(ONNXModel):
     """Object and pedestrian detection using YOLOv8"""
     
-    def __init__(self, model_path: str, class_names: Dict[int, str] = None, conf_threshold: float = 0.5):
-        super().__init__(model_path)
+    def __init__(self, model_path: str, class_names: Dict[int, str] = None, conf_threshold: float = 0.5,
+                 intra_op_threads: Optional[int] = None):
+        super().__init__(model_path, input_scale=1.0 / 255.0, intra_op_threads=intra_op_threads)
         self.conf_threshold = conf_threshold
         self.iou_threshold = 0.45
         
@@ -624,10 +890,28 @@ class ObjectDetector(ONNXModel):
         }
         
         self.pedestrian_classes = ['person']
+        self._class_id_array = np.array(list(self.class_names), dtype=np.int64)
+        # Per-class box colors from an independent generator (no global RNG reseeding per draw)
+        self._class_colors = {cid: tuple(np.random.default_rng(cid).integers(0, 255, 3).tolist())
+                              for cid in self.class_names}
+        self._scale_x = None
+        self._scale_y = None
+    
+    def specialize(self, frame_shape: tuple):
+        """Also precompute the network-to-frame bbox scale factors"""
+        super().specialize(frame_shape)
+        h, w = self.frame_shape
+        self._scale_x = w / self.input_width
+        self._scale_y = h / self.input_height
     
     def postprocess(self, outputs: List[np.ndarray], original_image: np.ndarray, 
-                   depth_frame: Optional[np.ndarray] = None, kinect: Optional[KinectCamera] = None) -> List[DetectionResult]:
-        """Postprocess YOLOv8 output with Kinect depth"""
+                   depth_frame: Optional[np.ndarray] = None, kinect: Optional[KinectCamera] = None,
+                   depth_meters: Optional[np.ndarray] = None) -> List[DetectionResult]:
+        """Postprocess YOLOv8 output with Kinect depth
+
+        depth_meters (from KinectCamera.depth_to_meters) takes precedence over
+        depth_frame/kinect so the conversion can be shared across detectors.
+        """
         output = outputs[0]
         
         # If shape is [1, 84, 8400], transpose it to [1, 8400, 84]
@@ -639,48 +923,53 @@ class ObjectDetector(ONNXModel):
         
         detections = []
         h, w = original_image.shape[:2]
-        scale_x = w / self.input_width
-        scale_y = h / self.input_height
-        
-        # Get the number of attributes (e.g., 84)
-        num_attrs = output.shape[1]
+        if (h, w) == self.frame_shape:
+            scale_x, scale_y = self._scale_x, self._scale_y
+        else:
+            scale_x = w / self.input_width
+            scale_y = h / self.input_height
+        
+        # Best class and its score for every anchor at once
+        class_scores = output[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        confidences = class_scores[np.arange(len(output)), class_ids]
+        
+        # Keep anchors above threshold and in the ADAS-relevant classes
+        keep = (confidences >= self.conf_threshold) & np.isin(class_ids, self._class_id_array)
+        boxes = output[keep, :4]
+        class_ids = class_ids[keep]
+        confidences = confidences[keep]
+        
+        # Bounding box calculation (xywh -> clipped xyxy in frame pixels)
+        half_w = boxes[:, 2] / 2
+        half_h = boxes[:, 3] / 2
+        xyxy = np.column_stack([
+            (boxes[:, 0] - half_w) * scale_x,
+            (boxes[:, 1] - half_h) * scale_y,
+            (boxes[:, 0] + half_w) * scale_x,
+            (boxes[:, 1] + half_h) * scale_y,
+        ]).astype(np.int32)
+        np.clip(xyxy[:, 0::2], 0, w, out=xyxy[:, 0::2])
+        np.clip(xyxy[:, 1::2], 0, h, out=xyxy[:, 1::2])
+        
+        # NMS on the decoded arrays, so depth is only looked up for the kept boxes
+        keep = self._nms_indices(xyxy, confidences)
+        xyxy = xyxy[keep]
+        class_ids = class_ids[keep]
+        confidences = confidences[keep]
+        
+        # One batched depth lookup for every kept box
+        if depth_meters is not None:
+            distances = bbox_distances(depth_meters, xyxy)
+        elif depth_frame is not None and kinect is not None:
+            distances = kinect.get_bbox_distances_batch(depth_frame, xyxy)
+        else:
+            distances = np.full(len(xyxy), -1.0)
         
-        for detection in output:
-            x_center, y_center, width, height = detection[:4]
-            
-            # Get all class scores (from index 4 to the end)
-            class_scores = detection[4:num_attrs]
-            
-            # Find the highest score and its class ID
-            class_id = int(class_scores.argmax())
-            confidence = class_scores[class_id]
-            
-            # Check if the highest score is above our threshold
-            if confidence < self.conf_threshold:
-                continue
-            
-            class_conf = confidence 
-            
-            # Filter to only ADAS-relevant classes
-            if class_id not in self.class_names:
-                continue
-            
-            # Bounding box calculation
-            x1 = int((x_center - width / 2) * scale_x)
-            y1 = int((y_center - height / 2) * scale_y)
-            x2 = int((x_center + width / 2) * scale_x)
-            y2 = int((y_center + height / 2) * scale_y)
-            
-            x1 = max(0, min(x1, w))
-            y1 = max(0, min(y1, h))
-            x2 = max(0, min(x2, w))
-            y2 = max(0, min(y2, h))
-            
-            distance = None
-            if depth_frame is not None and kinect is not None:
-                distance = kinect.get_bbox_distance(depth_frame, (x1, y1, x2, y2))
-            
-            if distance is None or distance <= 0:
+        # Only the surviving detections (typically a handful) are visited in Python
+        for (x1, y1, x2, y2), class_id, class_conf, distance in zip(
+                xyxy.tolist(), class_ids.tolist(), confidences.tolist(), distances.tolist()):
+            if distance <= 0:
                 distance = self._estimate_distance(y2 - y1, h)
             
             class_name = self.class_names[class_id]
@@ -695,45 +984,29 @@ class ObjectDetector(ONNXModel):
                 is_pedestrian=is_pedestrian
             ))
         
-        detections = self.apply_nms(detections)
         return detections
 
+    def _nms_indices(self, xyxy: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """Indices kept by Non-Maximum Suppression, highest score first"""
+        if len(xyxy) == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(xyxy) == 1:
+            # Nothing to suppress; only NMSBoxes' score cut (strictly greater) applies
+            return np.zeros(int(scores[0] > self.conf_threshold), dtype=np.int64)
+        
+        # Plain lists convert faster than ndarrays at the cv2 boundary for small N
+        boxes = np.column_stack([xyxy[:, :2], xyxy[:, 2:] - xyxy[:, :2]]).tolist()
+        keep = cv2.dnn.NMSBoxes(boxes, np.asarray(scores).tolist(), self.conf_threshold, self.iou_threshold)
+        return np.asarray(keep, dtype=np.int64).flatten()
+
     def apply_nms(self, detections: List[DetectionResult]) -> List[DetectionResult]:
-        """Apply Non-Maximum Suppression"""
+        """Apply Non-Maximum Suppression (OpenCV C++ implementation)"""
         if len(detections) == 0:
             return []
         
         boxes = np.array([det.bbox for det in detections])
         scores = np.array([det.confidence for det in detections])
-        
-        x1 = boxes[:, 0]
-        y1 = boxes[:, 1]
-        x2 = boxes[:, 2]
-        y2 = boxes[:, 3]
-        
-        areas = (x2 - x1) * (y2 - y1)
-        order = scores.argsort()[::-1]
-        
-        keep = []
-        while len(order) > 0:
-            i = order[0]
-            keep.append(i)
-            
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
-            
-            w = np.maximum(0, xx2 - xx1)
-            h = np.maximum(0, yy2 - yy1)
-            
-            inter = w * h
-            iou = inter / (areas[i] + areas[order[1:]] - inter)
-            
-            inds = np.where(iou <= self.iou_threshold)[0]
-            order = order[inds + 1]
-        
-        return [detections[i] for i in keep]
+        return [detections[i] for i in self._nms_indices(boxes, scores)]
     
     def _estimate_distance(self, bbox_height: int, image_height: int) -> float:
         """Estimate distance based on bounding box height"""
@@ -744,9 +1017,10 @@ class ObjectDetector(ONNXModel):
         distance = (real_height * focal_length) / bbox_height
         return min(distance, 100.0)
     
-    def draw_detections(self, image: np.ndarray, detections: List[DetectionResult]) -> np.ndarray:
-        """Draw detected objects/pedestrians on image"""
-        overlay = image.copy()
+    def draw_detections(self, image: np.ndarray, detections: List[DetectionResult],
+                        inplace: bool = True) -> np.ndarray:
+        """Draw detected objects/pedestrians on image (into image unless inplace=False)"""
+        overlay = image if inplace else image.copy()
         
         for det in detections:
             x1, y1, x2, y2 = det.bbox
@@ -772,11 +1046,20 @@ class ObjectDetector(ONNXModel):
     
     def _get_color(self, class_id: int) -> Tuple[int, int, int]:
         """Get consistent color for class"""
-        np.random.seed(class_id)
-        return tuple(np.random.randint(0, 255, 3).tolist())
+        return self._class_colors[class_id]
 
 # ==================== INTEGRATED ADAS SYSTEM ====================
 
+# Traffic sign color gate: skip the sign model on frames with no sign-like colors
+SIGN_GATE_SIZE = (160, 160)
+SIGN_GATE_MIN_PIXELS = 30
+SIGN_HSV_RANGES = [  # (lower, upper) in OpenCV HSV (H: 0-179)
+    ((0, 120, 70), (10, 255, 255)),     # red (low hue)
+    ((170, 120, 70), (179, 255, 255)),  # red (wrap-around)
+    ((100, 120, 70), (130, 255, 255)),  # blue
+    ((20, 120, 70), (35, 255, 255)),    # yellow
+]
+
 class AdasSystem:
     """Integrated ADAS system for road monitoring (Xbox Kinect)"""
     
@@ -792,14 +1075,20 @@ class AdasSystem:
         """
         logger.info("Initializing ADAS System (Road Monitoring)...")
         
+        # Lane/sign inference runs on a pool alongside object detection, so the
+        # sessions share the cores instead of each claiming all of them
+        threads_per_model = max(1, (os.cpu_count() or 4) // 2)
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='adas')
+        
         logger.info("Loading Lane Detection model...")
-        self.lane_detector = LaneDetector(lane_model)
+        self.lane_detector = LaneDetector(lane_model, intra_op_threads=threads_per_model)
         
         logger.info("Loading Object Detection model...")
-        self.object_detector = ObjectDetector(object_model)
+        self.object_detector = ObjectDetector(object_model, intra_op_threads=threads_per_model)
         
         logger.info("Loading Traffic Sign Detection model...")
-        self.sign_detector = ObjectDetector(sign_model, class_names=SIGN_CLASSES, conf_threshold=0.4)
+        self.sign_detector = ObjectDetector(sign_model, class_names=SIGN_CLASSES, conf_threshold=0.4,
+                                            intra_op_threads=threads_per_model)
         logger.info("✓ Traffic sign detector initialized as YOLOv8 detection model")
         
         self.use_kinect = use_kinect
@@ -810,11 +1099,14 @@ class AdasSystem:
                 logger.warning("Kinect not available, falling back to standard camera")
                 self.use_kinect = False
                 self.kinect = None
+            else:
+                self.kinect.start_capture()
         else:
             self.kinect = None
         
         self.fps = 0
-        self.frame_times = []
+        self._ema_frame_time = 0.0  # Exponential moving average of frame time (s)
+        self._fps_alpha = 0.05
         
         # Performance optimization for Raspberry Pi 5: Process modules at different intervals
         self.frame_counter = 0
@@ -823,6 +1115,10 @@ class AdasSystem:
         self.last_lane_result = LaneResult(None, None, None, 0.0, 0.0, None)
         self.last_sign_detections = []
         
+        # Camera resolution is fixed after the first frame; see _specialize()
+        self._frame_shape = None
+        self._annotated = None
+        
         logger.info("=" * 60)
         logger.info("✓ ADAS SYSTEM READY!")
         logger.info("=" * 60)
@@ -830,38 +1126,95 @@ class AdasSystem:
     def get_frame(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """Get frame from Kinect or standard camera"""
         if self.use_kinect and self.kinect:
-            return self.kinect.get_frame()
+            return self.kinect.get_latest_frame()
         return None, None
     
-    def process_frame(self, frame: np.ndarray, depth_frame: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict]:
-        """Process single frame through all ADAS modules"""
-        start_time = time.time()
+    def _specialize(self, frame_shape: tuple):
+        """Specialize every model for the camera resolution (runs once per resolution)"""
+        self._frame_shape = frame_shape
+        self._annotated = np.empty(frame_shape, dtype=np.uint8)
+        logger.info(f"Specializing pipeline for {frame_shape[1]}x{frame_shape[0]} frames")
+        for model in (self.lane_detector, self.object_detector, self.sign_detector):
+            model.specialize(frame_shape)
+    
+    def _run_lane(self, frame: np.ndarray) -> LaneResult:
+        """Full lane pipeline for one frame (runs on the worker pool)"""
+        lane_input = self.lane_detector.preprocess(frame)
+        lane_output = self.lane_detector.inference(lane_input)
+        return self.lane_detector.postprocess(lane_output, frame)
+    
+    @staticmethod
+    def _has_sign_colors(frame: np.ndarray) -> bool:
+        """Cheap HSV gate: does the frame contain enough saturated red/blue/yellow pixels for a sign?"""
+        small = cv2.resize(frame, SIGN_GATE_SIZE, interpolation=cv2.INTER_NEAREST)
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv, *SIGN_HSV_RANGES[0])
+        for lower, upper in SIGN_HSV_RANGES[1:]:
+            mask |= cv2.inRange(hsv, lower, upper)
+        return cv2.countNonZero(mask) >= SIGN_GATE_MIN_PIXELS
+    
+    def _run_signs(self, frame: np.ndarray, depth_meters: Optional[np.ndarray]) -> List[DetectionResult]:
+        """Full traffic sign pipeline for one frame (runs on the worker pool)"""
+        if not self._has_sign_colors(frame):
+            return []
+        sign_input = self.sign_detector.preprocess(frame)
+        sign_output = self.sign_detector.inference(sign_input)
+        return self.sign_detector.postprocess(sign_output, frame, depth_meters=depth_meters)
+    
+    def process_frame(self, frame: np.ndarray, depth_frame: Optional[np.ndarray] = None,
+                      inplace: bool = False) -> Tuple[np.ndarray, Dict]:
+        """Process single frame through all ADAS modules
+        
+        Args:
+            frame: BGR frame
+            depth_frame: Raw Kinect depth frame (optional)
+            inplace: Annotate directly into frame instead of a copy. Only safe when
+                the caller owns the buffer and does not need the clean image afterwards.
+        
+        Otherwise the frame is copied once into a reused annotation buffer, so the
+        returned image is only valid until the next call.
+        """
+        start_time = time.perf_counter()
+        
+        if frame.shape != self._frame_shape:
+            self._specialize(frame.shape)
         
         self.frame_counter += 1
         
+        # Convert depth once per frame; shared by object and sign postprocessing
+        depth_meters = KinectCamera.depth_to_meters(depth_frame) if self.kinect else None
+        
         # Lane Detection (Process every 2 frames for Pi 5 optimization)
+        lane_future = None
         if self.frame_counter % self.lane_process_interval == 0:
-            lane_input = self.lane_detector.preprocess(frame)
-            lane_output = self.lane_detector.inference(lane_input)
-            self.last_lane_result = self.lane_detector.postprocess(lane_output, frame)
+            lane_future = self._pool.submit(self._run_lane, frame)
         
-        lane_result = self.last_lane_result
+        # Traffic Sign Detection (Process every 5 frames for Pi 5 optimization)
+        sign_future = None
+        if self.frame_counter % self.sign_process_interval == 0:
+            sign_future = self._pool.submit(self._run_signs, frame, depth_meters)
         
         # Object & Pedestrian Detection (Always process - most critical for safety)
         obj_input = self.object_detector.preprocess(frame)
-        obj_output = self.object_detector.inference(obj_input/255.0)
-        detections = self.object_detector.postprocess(obj_output, frame, depth_frame, self.kinect)
+        obj_output = self.object_detector.inference(obj_input)
+        detections = self.object_detector.postprocess(obj_output, frame, depth_meters=depth_meters)
         
-        # Traffic Sign Detection (Process every 5 frames for Pi 5 optimization)
-        if self.frame_counter % self.sign_process_interval == 0:
-            sign_input = self.sign_detector.preprocess(frame)
-            sign_output = self.sign_detector.inference(sign_input/255.0)
-            self.last_sign_detections = self.sign_detector.postprocess(sign_output, frame, depth_frame, self.kinect)
+        # Wait for the background models before drawing over the frame
+        if lane_future is not None:
+            self.last_lane_result = lane_future.result()
+        if sign_future is not None:
+            self.last_sign_detections = sign_future.result()
         
+        lane_result = self.last_lane_result
         sign_detections = self.last_sign_detections
         
-        # Draw all results
-        annotated = frame.copy()
+        # Draw all results (all model inputs have been consumed at this point)
+        # Single copy into the reused buffer; both drawers then mutate it in place
+        if inplace:
+            annotated = frame
+        else:
+            np.copyto(self._annotated, frame)
+            annotated = self._annotated
         annotated = self.lane_detector.draw_lanes(annotated, lane_result)
         annotated = self.object_detector.draw_detections(annotated, detections)
         
@@ -876,12 +1229,13 @@ class AdasSystem:
             cv2.rectangle(annotated, (x1, y1 - label_h - 10), (x1 + label_w, y1), color, -1)
             cv2.putText(annotated, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
-        # Calculate FPS
-        frame_time = time.time() - start_time
-        self.frame_times.append(frame_time)
-        if len(self.frame_times) > 30:
-            self.frame_times.pop(0)
-        self.fps = 1.0 / (sum(self.frame_times) / len(self.frame_times))
+        # Calculate FPS (monotonic clock, EMA smoothing)
+        frame_time = time.perf_counter() - start_time
+        if self._ema_frame_time:
+            self._ema_frame_time += self._fps_alpha * (frame_time - self._ema_frame_time)
+        else:
+            self._ema_frame_time = frame_time
+        self.fps = 1.0 / self._ema_frame_time if self._ema_frame_time > 0 else 0.0
         
         # Draw FPS and camera source
         camera_source = "Kinect" if self.use_kinect else "Standard"
@@ -910,10 +1264,81 @@ class AdasSystem:
         return annotated, results
     
     def release(self):
-        """Release camera resources"""
+        """Release camera resources and worker threads"""
+        self._pool.shutdown(wait=True)
         if self.kinect:
             self.kinect.release()
 
+# ==================== DISPLAY WORKER ====================
+
+class DisplayWorker:
+    """Runs cv2.imshow/waitKey on a background thread.
+
+    The main loop pushes the latest annotated frame into a 1-slot mailbox and
+    never waits on the GUI; frames that arrive before the previous one was
+    shown are simply replaced. push() copies into a buffer the worker owns, so
+    the caller can overwrite its frame while the previous one is still being
+    shown; buffers are recycled once shown or replaced. Key presses are handed
+    back through pop_key().
+    """
+
+    def __init__(self, window_name: str):
+        self.window_name = window_name
+        self.running = False
+        self._display_slot = [None]
+        self._free_buffers = []
+        self._display_lock = threading.Lock()
+        self._key = -1
+        self._thread = None
+
+    def start(self):
+        """Start the display thread"""
+        self.running = True
+        self._thread = threading.Thread(target=self._display_worker, daemon=True)
+        self._thread.start()
+
+    def push(self, image: np.ndarray):
+        """Replace the pending frame with a copy of image (non-blocking)"""
+        with self._display_lock:
+            buffer = self._free_buffers.pop() if self._free_buffers else None
+        if buffer is None or buffer.shape != image.shape or buffer.dtype != image.dtype:
+            buffer = np.empty_like(image)
+        np.copyto(buffer, image)
+        with self._display_lock:
+            replaced, self._display_slot[0] = self._display_slot[0], buffer
+            if replaced is not None:
+                self._free_buffers.append(replaced)
+
+    def pop_key(self) -> int:
+        """Return the last key pressed since the previous call (-1 if none)"""
+        with self._display_lock:
+            key, self._key = self._key, -1
+        return key
+
+    def _display_worker(self):
+        """Show the newest frame and poll the keyboard"""
+        while self.running:
+            with self._display_lock:
+                img, self._display_slot[0] = self._display_slot[0], None
+            if img is not None:
+                cv2.imshow(self.window_name, img)
+                with self._display_lock:
+                    self._free_buffers.append(img)
+            key = cv2.waitKey(1)
+            if key != -1:
+                with self._display_lock:
+                    self._key = key & 0xFF
+            if img is None:
+                time.sleep(0.005)
+        cv2.destroyAllWindows()
+
+    def stop(self):
+        """Stop the display thread and close its windows"""
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
 # ==================== EXAMPLE USAGE ====================
 
 def main():
@@ -934,9 +1359,10 @@ def main():
     except:
         logger.warning("Could not set CPU governor to performance mode")
     
-    LANE_MODEL = "../models/Lane_Detection/enet_sad.onnx"
-    OBJECT_MODEL = "../models/Object_Detection/yolov8n.onnx"
-    SIGN_MODEL = "../models/Traffic_Sign/last.onnx"
+    # INT8 variants (see quantize_models.py) are used when they have been generated
+    LANE_MODEL = prefer_int8_model("../models/Lane_Detection/enet_sad.onnx")
+    OBJECT_MODEL = prefer_int8_model("../models/Object_Detection/yolov8n.onnx")
+    SIGN_MODEL = prefer_int8_model("../models/Traffic_Sign/last.onnx")
 
     logger.info("=" * 60)
     logger.info("STARTING ADAS SYSTEM INITIALIZATION")
@@ -990,9 +1416,17 @@ def main():
     logger.info("=" * 60)
     
     frame_count = 0
+    # Standard camera reads reuse one buffer; the display thread gets its own copy
+    frame_buffer = None
     led_state = 0  # For LED cycling: 0=green, 1=yellow, 2=red
     led_colors = [freenect.LED_GREEN, freenect.LED_YELLOW, freenect.LED_RED]
     
+    # GUI runs on its own thread so imshow/waitKey never stalls the next capture
+    display = None
+    if not args.headless:
+        display = DisplayWorker('ADAS System - Road Monitoring')
+        display.start()
+    
     try:
         while True:
             if adas.use_kinect:
@@ -1001,7 +1435,8 @@ def main():
                     logger.error("Failed to get frame from Kinect")
                     break
             else:
-                ret, frame = cap.read()
+                ret, frame = cap.read(frame_buffer)
+                frame_buffer = frame
                 if not ret:
                     logger.error("Failed to read from camera")
                     break
@@ -1011,7 +1446,9 @@ def main():
             if frame_count % 30 == 0:
                 logger.info(f"Processing frame {frame_count}...")
             
-            annotated, results = adas.process_frame(frame, depth_frame)
+            # Kinect frames are freshly converted per call and DisplayWorker.push
+            # copies, so drawing into the capture buffer is safe
+            annotated, results = adas.process_frame(frame, depth_frame, inplace=True)
             
             # Display or save based on mode
             if args.headless:
@@ -1021,8 +1458,8 @@ def main():
                     cv2.imwrite(output_file, annotated)
                     logger.info(f"Saved frame to {output_file}")
             else:
-                # Normal mode - display window
-                cv2.imshow('ADAS System - Road Monitoring', annotated)
+                # Normal mode - hand the frame to the display thread
+                display.push(annotated)
             
             # Print results every 30 frames to avoid flooding console
             if frame_count % 30 == 0:
@@ -1049,8 +1486,8 @@ def main():
                     break
                 time.sleep(0.001)  # Small delay
             else:
-                # Normal mode: wait for key
-                key = cv2.waitKey(1) & 0xFF
+                # Normal mode: key presses are collected by the display thread
+                key = display.pop_key()
                 
                 if key == ord('q'):
                     logger.info("User pressed 'q' - exiting...")
@@ -1099,7 +1536,8 @@ def main():
         adas.release()
         if not adas.use_kinect:
             cap.release()
-        cv2.destroyAllWindows()
+        if display is not None:
+            display.stop()
         logger.info("=" * 60)
         logger.info("ADAS SYSTEM STOPPED")
         logger.info("=" * 60)
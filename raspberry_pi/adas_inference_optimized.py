@@ -15,9 +15,16 @@ from dataclasses import dataclass
 import logging
 import os
 import sys
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Only set ONNX logging level, don't touch Qt settings
 os.environ['ORT_LOGGING_LEVEL'] = '3'
+# Keep OpenMP workers (OpenMP builds of onnxruntime only) on the cores they start on
+os.environ.setdefault('OMP_PROC_BIND', 'close')
+os.environ.setdefault('OMP_PLACES', 'cores')
 
 # Import freenect
 try:
@@ -31,6 +38,30 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('ADAS')
 
+# ==================== CPU AFFINITY ====================
+
+# Core 0 runs the Kinect: libfreenect's USB thread (started by the first
+# sync_get_video(), inheriting that thread's affinity) and the capture stage.
+# Inference keeps off it to avoid jitter.
+CAPTURE_CORES = {0}
+INFERENCE_CORES = {1, 2, 3}
+# Cores the process may use, captured before any thread is pinned to a subset
+ALLOWED_CORES = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else set()
+
+def pin_current_thread(cores: set, label: str):
+    """Restrict the calling thread (and threads it creates later) to cores, if supported"""
+    if not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        usable = cores & ALLOWED_CORES
+        if not usable:
+            logger.warning(f"{label}: none of cores {sorted(cores)} available - not pinning")
+            return
+        os.sched_setaffinity(0, usable)
+        logger.info(f"{label} pinned to cores {sorted(usable)}")
+    except OSError as e:
+        logger.warning(f"{label}: could not set CPU affinity ({e})")
+
 # ==================== DISPLAY DETECTION ====================
 
 def detect_display():
@@ -92,6 +123,7 @@ class KinectCamera:
 
     def __init__(self):
         self.connected = False
+        self._raw_rgb = None  # frame held between grab() and retrieve()
         
         if not FREENECT_AVAILABLE:
             logger.error("Freenect not available!")
@@ -132,32 +164,50 @@ class KinectCamera:
         logger.info("✓ KINECT READY")
         logger.info("=" * 60)
 
-    def get_frame(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Get RGB and depth frames"""
+    def grab(self) -> bool:
+        """Fetch the next raw RGB frame without converting it (see retrieve)"""
+        self._raw_rgb = None
         if not self.connected:
-            return None, None
+            return False
 
         try:
             rgb_result = freenect.sync_get_video()
             if not rgb_result or rgb_result[0] is None:
-                return None, None
-
-            rgb_frame = rgb_result[0]
-            rgb_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
-
-            depth_frame = None
-            try:
-                depth_result = freenect.sync_get_depth()
-                if depth_result and depth_result[0] is not None:
-                    depth_frame = depth_result[0]
-            except:
-                pass
+                return False
 
-            return rgb_frame, depth_frame
+            self._raw_rgb = rgb_result[0]
+            return True
 
         except Exception as e:
             logger.error(f"Frame capture error: {e}")
+            return False
+
+    def retrieve(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """RGB frame for the last grab() plus the current depth frame
+
+        The frame is handed over as freenect produced it: the models swap channels
+        inside blobFromImage and AdasSystem converts to BGR only when drawing.
+        """
+        rgb_frame = self._raw_rgb
+        if rgb_frame is None:
             return None, None
+        self._raw_rgb = None
+
+        depth_frame = None
+        try:
+            depth_result = freenect.sync_get_depth()
+            if depth_result and depth_result[0] is not None:
+                depth_frame = depth_result[0]
+        except:
+            pass
+
+        return rgb_frame, depth_frame
+
+    def get_frame(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Get RGB and depth frames"""
+        if not self.grab():
+            return None, None
+        return self.retrieve()
 
     def get_bbox_distance(self, depth_frame: np.ndarray, bbox: Tuple[int, int, int, int]) -> float:
         """Calculate distance from depth"""
@@ -177,10 +227,25 @@ class KinectCamera:
             return -1.0
 
         valid_depths = roi[(roi > 0) & (roi < 10000)]
-        if len(valid_depths) == 0:
+        n = len(valid_depths)
+        if n == 0:
             return -1.0
 
-        return float(np.median(valid_depths) / 1000.0)
+        # Quickselect the middle element(s) in place instead of np.median's extra copy
+        k = n // 2
+        if n % 2:
+            valid_depths.partition(k)
+            median = float(valid_depths[k])
+        else:
+            valid_depths.partition((k - 1, k))
+            median = (float(valid_depths[k - 1]) + float(valid_depths[k])) / 2.0
+
+        return median / 1000.0
+
+    def get_bbox_distances(self, depth_frame: np.ndarray,
+                           bboxes: List[Tuple[int, int, int, int]]) -> List[float]:
+        """get_bbox_distance for several boxes of the same depth frame"""
+        return [self.get_bbox_distance(depth_frame, bbox) for bbox in bboxes]
 
     def release(self):
         """Cleanup"""
@@ -194,20 +259,82 @@ class KinectCamera:
 
 # ==================== ONNX MODEL BASE ====================
 
+# TensorRT engines are built on first load and reused from here on later starts
+TRT_ENGINE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models', 'trt_cache')
+
+# Attached accelerators (OpenVINO: Intel NCS2, TensorRT: Jetson companion) first, then
+# NEON-optimized CPU EPs; each is used only if this onnxruntime build ships it
+PREFERRED_PROVIDERS = [
+    ('OpenVINOExecutionProvider', {}),
+    ('TensorrtExecutionProvider', {
+        'trt_fp16_enable': 'True',
+        'trt_engine_cache_enable': 'True',
+        'trt_engine_cache_path': TRT_ENGINE_CACHE_DIR,
+    }),
+    ('ArmNNExecutionProvider', {}),
+    ('ACLExecutionProvider', {'enable_fast_math': '1'}),
+    ('XnnpackExecutionProvider', {}),
+    ('CPUExecutionProvider', {}),
+]
+
+def select_providers() -> List[Tuple[str, Dict[str, str]]]:
+    """Available providers from PREFERRED_PROVIDERS, CPU always last as the fallback"""
+    available = ort.get_available_providers()
+    if 'TensorrtExecutionProvider' in available:
+        os.makedirs(TRT_ENGINE_CACHE_DIR, exist_ok=True)
+    return [(name, opts) for name, opts in PREFERRED_PROVIDERS if name in available]
+
+def prefer_model_variant(model_path: str, suffixes: Tuple[str, ...] = ('_int8',)) -> str:
+    """Return the first <model><suffix>.onnx produced by quantize_models.py that exists"""
+    base = os.path.splitext(model_path)[0]
+    for suffix in suffixes:
+        variant_path = base + suffix + '.onnx'
+        if os.path.exists(variant_path):
+            logger.info(f"Using {suffix[1:].upper()} model: {variant_path}")
+            return variant_path
+    return model_path
+
+# ONNX tensor element types the preallocated output buffers support
+_ORT_TENSOR_TYPES = {
+    'tensor(float)': np.float32,
+    'tensor(float16)': np.float16,
+    'tensor(double)': np.float64,
+    'tensor(int64)': np.int64,
+    'tensor(int32)': np.int32,
+    'tensor(uint8)': np.uint8,
+    'tensor(bool)': np.bool_,
+}
+
 class ONNXModel:
     """Base ONNX model class"""
     
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, input_scale: float = 1.0, intra_op_threads: int = 4,
+                 rgb_input: bool = False):
+        self.input_scale = input_scale
+        self.rgb_input = rgb_input  # frames already RGB (Kinect) - no channel swap needed
         try:
             sess_options = ort.SessionOptions()
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-            sess_options.intra_op_num_threads = 4
-            sess_options.inter_op_num_threads = 2
+            
+            # Prefer the graph pre-optimized by `quantize_models.py --optimize`, which
+            # needs no optimization passes at startup; ignore it if the model is newer
+            optimized_path = os.path.splitext(model_path)[0] + '.opt.onnx'
+            if (os.path.exists(optimized_path) and
+                    os.path.getmtime(optimized_path) >= os.path.getmtime(model_path)):
+                logger.info(f"Using pre-optimized model: {optimized_path}")
+                model_path = optimized_path
+                sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            else:
+                sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            # Parallelism comes from running the models side by side (AdasSystem),
+            # so each session runs its graph sequentially with a small intra-op pool
+            sess_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+            sess_options.intra_op_num_threads = intra_op_threads
+            sess_options.inter_op_num_threads = 1
             
             self.session = ort.InferenceSession(
                 model_path, 
                 sess_options=sess_options, 
-                providers=['CPUExecutionProvider']
+                providers=select_providers()
             )
             
             self.input_name = self.session.get_inputs()[0].name
@@ -222,24 +349,68 @@ class ONNXModel:
                 self.input_height = 640
                 self.input_width = 640
             
-            logger.info(f"✓ {os.path.basename(model_path)} ({self.input_width}x{self.input_height})")
+            # Persistent input/output binding: preprocess writes into _input_buffer,
+            # which the OrtValue wraps without a copy, so no per-frame tensor allocation
+            self._input_buffer = np.zeros((1, 3, self.input_height, self.input_width), dtype=np.float32)
+            self._input_ortvalue = ort.OrtValue.ortvalue_from_numpy(self._input_buffer)
+            self.io_binding = self.session.io_binding()
+            self.io_binding.bind_ortvalue_input(self.input_name, self._input_ortvalue)
+            
+            # Static output shapes (e.g. YOLOv8's (1, 84, 8400)) get preallocated
+            # buffers that ORT writes into directly; only if some output has a
+            # dynamic shape does ORT allocate (and inference copy) per run
+            self._output_buffers = self._allocate_outputs()
+            if self._output_buffers is not None:
+                for name, buffer in zip(self.output_names, self._output_buffers):
+                    self.io_binding.bind_ortvalue_output(name, ort.OrtValue.ortvalue_from_numpy(buffer))
+            else:
+                for name in self.output_names:
+                    self.io_binding.bind_output(name, 'cpu')
+            
+            logger.info(f"✓ {os.path.basename(model_path)} ({self.input_width}x{self.input_height}) "
+                        f"on {self.session.get_providers()[0]}")
             
         except Exception as e:
             logger.error(f"Failed to load {model_path}: {e}")
             raise
     
+    def _allocate_outputs(self) -> Optional[List[np.ndarray]]:
+        """One buffer per output if every output has a static shape and known type, else None"""
+        buffers = []
+        for output in self.session.get_outputs():
+            dtype = _ORT_TENSOR_TYPES.get(output.type)
+            if dtype is None or not all(isinstance(dim, int) for dim in output.shape):
+                return None
+            buffers.append(np.empty(output.shape, dtype=dtype))
+        return buffers
+    
     def preprocess(self, image: np.ndarray) -> np.ndarray:
-        """Preprocess image"""
-        img = cv2.resize(image, (self.input_width, self.input_height))
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img = np.transpose(img, (2, 0, 1))
-        img = np.expand_dims(img, axis=0)
-        return img.astype(np.float32)
+        """Preprocess image into the bound input buffer (valid until the next preprocess)
+        
+        Resize, BGR->RGB (unless rgb_input), input_scale, HWC->CHW and float32 in one
+        blobFromImage pass.
+        """
+        blob = cv2.dnn.blobFromImage(image, scalefactor=self.input_scale,
+                                     size=(self.input_width, self.input_height),
+                                     swapRB=not self.rgb_input, crop=False)
+        np.copyto(self._input_buffer, blob)
+        return self._input_buffer
     
     def inference(self, preprocessed_input: np.ndarray) -> List[np.ndarray]:
-        """Run inference"""
-        outputs = self.session.run(self.output_names, {self.input_name: preprocessed_input})
-        return outputs
+        """Run inference
+        
+        With static output shapes the returned arrays are the bound output
+        buffers, overwritten by this model's next inference call.
+        """
+        if preprocessed_input.shape != self._input_buffer.shape:
+            return self.session.run(self.output_names, {self.input_name: preprocessed_input})
+        
+        if preprocessed_input is not self._input_buffer:
+            np.copyto(self._input_buffer, preprocessed_input, casting='unsafe')
+        self.session.run_with_iobinding(self.io_binding)
+        if self._output_buffers is not None:
+            return self._output_buffers
+        return self.io_binding.copy_outputs_to_cpu()
 
 
 # ==================== LANE DETECTOR ====================
@@ -251,43 +422,46 @@ class LaneDetector(ONNXModel):
         """Postprocess lane output"""
         output = outputs[0]
         
-        exp_x = np.exp(output - np.max(output, axis=1, keepdims=True))
-        seg_pred = exp_x / np.sum(exp_x, axis=1, keepdims=True)
-        seg_mask = np.argmax(seg_pred[0], axis=0)
+        # Softmax is monotonic, so the argmax of the logits is the argmax of the probabilities
+        seg_mask = np.argmax(output[0], axis=0).astype(np.uint8)
         
+        # Kept at model resolution; draw() upsamples only the overlay it blends
         h, w = original_image.shape[:2]
-        seg_mask = cv2.resize(seg_mask, (w, h), interpolation=cv2.INTER_NEAREST)
-        
         departure = self._calc_departure(seg_mask, (h, w))
         
         return LaneResult(seg_mask, departure, 0.8, None)
     
     def _calc_departure(self, mask: np.ndarray, shape: tuple) -> float:
-        """Calculate lane departure"""
+        """Calculate lane departure from a mask at any resolution for a frame of shape (h, w)"""
         h, w = shape
         center_x = w / 2
+        mask_h, mask_w = mask.shape[:2]
         
-        bottom = mask[h//2:, :]
+        bottom = mask[mask_h//2:, :]
         lane_px = np.where(bottom > 0)
         
         if len(lane_px[1]) == 0:
             return 0.0
         
-        lane_center = np.mean(lane_px[1])
+        # Mask column centres mapped back to frame columns
+        lane_center = (np.mean(lane_px[1]) + 0.5) * (w / mask_w) - 0.5
         departure = (lane_center - center_x) / center_x
         
         return float(np.clip(departure, -1.0, 1.0))
     
-    def draw(self, image: np.ndarray, result: LaneResult) -> np.ndarray:
-        """Draw lanes"""
-        overlay = image.copy()
+    def draw(self, image: np.ndarray, result: LaneResult, inplace: bool = True) -> np.ndarray:
+        """Draw lanes (into image unless inplace=False)"""
+        overlay = image if inplace else image.copy()
         
+        h, w = image.shape[:2]
         if result.lane_mask is not None:
-            colored = np.zeros_like(image)
+            # Color at mask resolution, then one nearest-neighbour upsample of the overlay
+            colored = np.zeros(result.lane_mask.shape[:2] + (3,), dtype=np.uint8)
             colored[result.lane_mask > 0] = [0, 255, 0]
-            overlay = cv2.addWeighted(overlay, 0.7, colored, 0.3, 0)
+            if colored.shape[:2] != (h, w):
+                colored = cv2.resize(colored, (w, h), interpolation=cv2.INTER_NEAREST)
+            cv2.addWeighted(overlay, 0.7, colored, 0.3, 0, dst=overlay)
         
-        h, w = image.shape[:2]
         color = (0, 255, 0) if abs(result.lane_departure) < 0.1 else (0, 165, 255) if abs(result.lane_departure) < 0.3 else (0, 0, 255)
         cv2.putText(overlay, f"Departure: {result.lane_departure:.2f}", 
                    (10, h - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
@@ -300,8 +474,10 @@ class LaneDetector(ONNXModel):
 class ObjectDetector(ONNXModel):
     """YOLOv8 detector"""
     
-    def __init__(self, model_path: str, class_names: Dict[int, str] = None, conf_threshold: float = 0.5):
-        super().__init__(model_path)
+    def __init__(self, model_path: str, class_names: Dict[int, str] = None, conf_threshold: float = 0.5,
+                 intra_op_threads: int = 4, rgb_input: bool = False):
+        super().__init__(model_path, input_scale=1.0 / 255.0, intra_op_threads=intra_op_threads,
+                         rgb_input=rgb_input)
         self.conf_threshold = conf_threshold
         self.iou_threshold = 0.45
         
@@ -311,6 +487,7 @@ class ObjectDetector(ONNXModel):
         }
         
         self.pedestrian_classes = ['person']
+        self._class_id_array = np.array(list(self.class_names), dtype=np.int64)
     
     def postprocess(self, outputs: List[np.ndarray], original_image: np.ndarray,
                    depth_frame: Optional[np.ndarray] = None, 
@@ -323,83 +500,74 @@ class ObjectDetector(ONNXModel):
         
         output = output[0]
         
-        detections = []
         h, w = original_image.shape[:2]
         scale_x = w / self.input_width
         scale_y = h / self.input_height
         
-        for detection in output:
-            x_center, y_center, width, height = detection[:4]
-            class_scores = detection[4:]
-            
-            class_id = int(class_scores.argmax())
-            confidence = float(class_scores[class_id])
-            
-            if confidence < self.conf_threshold or class_id not in self.class_names:
-                continue
-            
-            x1 = int((x_center - width / 2) * scale_x)
-            y1 = int((y_center - height / 2) * scale_y)
-            x2 = int((x_center + width / 2) * scale_x)
-            y2 = int((y_center + height / 2) * scale_y)
-            
-            x1 = max(0, min(x1, w))
-            y1 = max(0, min(y1, h))
-            x2 = max(0, min(x2, w))
-            y2 = max(0, min(y2, h))
-            
-            distance = None
-            if depth_frame is not None and kinect is not None:
-                distance = kinect.get_bbox_distance(depth_frame, (x1, y1, x2, y2))
-            
+        # Decode, filter and NMS entirely on arrays; only NMS survivors become DetectionResults
+        class_scores = output[:, 4:]
+        best_scores = class_scores.max(axis=1)
+        candidates = np.flatnonzero(best_scores >= self.conf_threshold)
+        class_ids = class_scores[candidates].argmax(axis=1)
+        allowed = np.isin(class_ids, self._class_id_array)
+        candidates, class_ids = candidates[allowed], class_ids[allowed]
+        confidences = best_scores[candidates]
+        
+        boxes = output[candidates, :4]
+        half_w = boxes[:, 2] / 2
+        half_h = boxes[:, 3] / 2
+        xyxy = np.stack([(boxes[:, 0] - half_w) * scale_x,
+                         (boxes[:, 1] - half_h) * scale_y,
+                         (boxes[:, 0] + half_w) * scale_x,
+                         (boxes[:, 1] + half_h) * scale_y], axis=1).astype(np.int64)
+        np.clip(xyxy[:, 0::2], 0, w, out=xyxy[:, 0::2])
+        np.clip(xyxy[:, 1::2], 0, h, out=xyxy[:, 1::2])
+        
+        kept = self._nms_indices(xyxy, confidences)
+        
+        detections = []
+        for class_id, confidence, bbox in zip(class_ids[kept].tolist(), confidences[kept].tolist(),
+                                              map(tuple, xyxy[kept].tolist())):
             class_name = self.class_names[class_id]
             
             detections.append(DetectionResult(
                 class_id=class_id,
                 class_name=class_name,
                 confidence=confidence,
-                bbox=(x1, y1, x2, y2),
-                distance=distance,
+                bbox=bbox,
                 is_pedestrian=(class_name in self.pedestrian_classes)
             ))
         
-        return self.nms(detections)
+        # Depth lookups only for the boxes NMS kept
+        if depth_frame is not None and kinect is not None:
+            distances = kinect.get_bbox_distances(depth_frame, [det.bbox for det in detections])
+            for det, distance in zip(detections, distances):
+                det.distance = distance
+        
+        return detections
+    
+    def _nms_indices(self, xyxy: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """Indices kept by non-maximum suppression (OpenCV C++), highest score first"""
+        if len(xyxy) == 0:
+            return np.empty(0, dtype=np.int64)
+        
+        boxes = np.column_stack([xyxy[:, :2], xyxy[:, 2:] - xyxy[:, :2]]).tolist()
+        # Candidates are already confidence-filtered; threshold 0 keeps ones exactly at conf_threshold
+        keep = cv2.dnn.NMSBoxes(boxes, np.asarray(scores).tolist(), 0.0, self.iou_threshold)
+        return np.asarray(keep, dtype=np.int64).flatten()
     
     def nms(self, detections: List[DetectionResult]) -> List[DetectionResult]:
-        """Non-maximum suppression"""
+        """Non-maximum suppression (OpenCV C++ implementation)"""
         if len(detections) == 0:
             return []
         
-        boxes = np.array([d.bbox for d in detections])
+        boxes = np.array([d.bbox for d in detections], dtype=np.int64)
         scores = np.array([d.confidence for d in detections])
-        
-        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
-        areas = (x2 - x1) * (y2 - y1)
-        order = scores.argsort()[::-1]
-        
-        keep = []
-        while len(order) > 0:
-            i = order[0]
-            keep.append(i)
-            
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
-            
-            w = np.maximum(0, xx2 - xx1)
-            h = np.maximum(0, yy2 - yy1)
-            inter = w * h
-            
-            iou = inter / (areas[i] + areas[order[1:]] - inter)
-            inds = np.where(iou <= self.iou_threshold)[0]
-            order = order[inds + 1]
-        
-        return [detections[i] for i in keep]
+        return [detections[i] for i in self._nms_indices(boxes, scores)]
     
-    def draw(self, image: np.ndarray, detections: List[DetectionResult]) -> np.ndarray:
-        """Draw detections"""
-        overlay = image.copy()
+    def draw(self, image: np.ndarray, detections: List[DetectionResult], inplace: bool = True) -> np.ndarray:
+        """Draw detections (into image unless inplace=False)"""
+        overlay = image if inplace else image.copy()
         
         for det in detections:
             x1, y1, x2, y2 = det.bbox
@@ -420,23 +588,45 @@ class ObjectDetector(ONNXModel):
 
 # ==================== ADAS SYSTEM ====================
 
+# Object, lane and sign models can all be in flight for the same frame
+CONCURRENT_MODELS = 3
+
 class AdasSystem:
     """Main ADAS system"""
     
-    def __init__(self, lane_model: str, object_model: str, sign_model: str):
+    def __init__(self, lane_model: str, object_model: str, sign_model: str,
+                 kinect: Optional[KinectCamera] = None):
+        """kinect: an already opened camera (see main), otherwise one is opened here"""
         logger.info("Initializing ADAS...")
         
-        self.lane_detector = LaneDetector(lane_model)
-        self.object_detector = ObjectDetector(object_model)
-        self.sign_detector = ObjectDetector(sign_model, SIGN_CLASSES, 0.4)
-        
-        self.kinect = KinectCamera()
+        # Up to three models run at once; split the cores this thread may use
+        # (the inference cores once main() has pinned it) so that their
+        # intra-op pools together never exceed them
+        if hasattr(os, 'sched_getaffinity'):
+            cores = len(os.sched_getaffinity(0))
+        else:
+            cores = os.cpu_count() or 4
+        threads = max(1, cores // CONCURRENT_MODELS)
+        # Kinect frames arrive as RGB, which is what the models take
+        self.lane_detector = LaneDetector(lane_model, intra_op_threads=threads, rgb_input=True)
+        self.object_detector = ObjectDetector(object_model, intra_op_threads=threads, rgb_input=True)
+        self.sign_detector = ObjectDetector(sign_model, SIGN_CLASSES, 0.4, intra_op_threads=threads,
+                                            rgb_input=True)
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='adas-model')
+        
+        # Object and sign YOLOs usually take the same input; then one blob feeds both
+        self._share_sign_input = (
+            (self.sign_detector.input_width, self.sign_detector.input_height, self.sign_detector.input_scale) ==
+            (self.object_detector.input_width, self.object_detector.input_height, self.object_detector.input_scale))
+        
+        self.kinect = kinect if kinect is not None else KinectCamera()
         if not self.kinect.connected:
             logger.error("Kinect failed!")
             sys.exit(1)
         
         self.fps = 0
-        self.frame_times = []
+        self.frame_times = deque(maxlen=30)
+        self._time_sum = 0.0  # running sum of frame_times
         self.frame_count = 0
         
         self._last_lane = LaneResult(None, 0.0, 0.0, None)
@@ -444,54 +634,76 @@ class AdasSystem:
         
         logger.info("✓ ADAS READY!")
     
-    def process(self, frame: np.ndarray, depth: Optional[np.ndarray] = None):
-        """Process one frame"""
+    @staticmethod
+    def _run_model(model: ONNXModel, frame: np.ndarray) -> List[np.ndarray]:
+        """Preprocess + inference for one model"""
+        return model.inference(model.preprocess(frame))
+    
+    def process(self, frame: np.ndarray, depth: Optional[np.ndarray] = None, draw: bool = True):
+        """Process one RGB frame (from KinectCamera)
+        
+        Returns (annotated BGR image, results); the image is None when draw is False,
+        which skips the BGR conversion and all drawing for frames nobody will see.
+        """
         start = time.time()
         self.frame_count += 1
         
-        # Lane (every 2 frames)
+        # Lane (every 2 frames) and signs (every 5 frames) run on the pool while
+        # objects run here; each model owns its session and input buffer
+        lane_future = None
         if self.frame_count % 2 == 0:
-            lane_in = self.lane_detector.preprocess(frame)
-            lane_out = self.lane_detector.inference(lane_in)
-            self._last_lane = self.lane_detector.postprocess(lane_out, frame)
+            lane_future = self._pool.submit(self._run_model, self.lane_detector, frame)
         
         # Objects (always)
         obj_in = self.object_detector.preprocess(frame)
-        obj_out = self.object_detector.inference(obj_in / 255.0)
-        objects = self.object_detector.postprocess(obj_out, frame, depth, self.kinect)
         
-        # Signs (every 5 frames)
+        sign_future = None
         if self.frame_count % 5 == 0:
-            sign_in = self.sign_detector.preprocess(frame)
-            sign_out = self.sign_detector.inference(sign_in / 255.0)
-            self._last_signs = self.sign_detector.postprocess(sign_out, frame, depth, self.kinect)
+            if self._share_sign_input:
+                # obj_in is only rewritten by the next process() call, after this future resolves
+                sign_future = self._pool.submit(self.sign_detector.inference, obj_in)
+            else:
+                sign_future = self._pool.submit(self._run_model, self.sign_detector, frame)
+        
+        obj_out = self.object_detector.inference(obj_in)
+        objects = self.object_detector.postprocess(obj_out, frame, depth, self.kinect)
+        
+        if lane_future is not None:
+            self._last_lane = self.lane_detector.postprocess(lane_future.result(), frame)
+        if sign_future is not None:
+            self._last_signs = self.sign_detector.postprocess(sign_future.result(), frame, depth, self.kinect)
         
-        # Draw
-        annotated = frame.copy()
-        annotated = self.lane_detector.draw(annotated, self._last_lane)
-        annotated = self.object_detector.draw(annotated, objects)
-        annotated = self.object_detector.draw(annotated, self._last_signs)
+        # Draw onto one BGR copy of the frame; every drawer then mutates it in place
+        annotated = None
+        if draw:
+            annotated = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            self.lane_detector.draw(annotated, self._last_lane)
+            self.object_detector.draw(annotated, objects)
+            self.object_detector.draw(annotated, self._last_signs)
         
         # FPS
         elapsed = time.time() - start
+        if len(self.frame_times) == self.frame_times.maxlen:
+            self._time_sum -= self.frame_times[0]  # evicted by the append below
         self.frame_times.append(elapsed)
-        if len(self.frame_times) > 30:
-            self.frame_times.pop(0)
-        self.fps = 1.0 / (sum(self.frame_times) / len(self.frame_times))
+        self._time_sum += elapsed
+        self.fps = len(self.frame_times) / self._time_sum if self._time_sum > 0 else 0.0
         
-        cv2.putText(annotated, f"FPS: {self.fps:.1f}", 
-                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Pedestrian count
         pedestrians = [d for d in objects if d.is_pedestrian]
-        if len(pedestrians) > 0:
-            cv2.putText(annotated, f"Pedestrians: {len(pedestrians)}", 
-                       (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
         
-        # Sign count
-        if len(self._last_signs) > 0:
-            cv2.putText(annotated, f"Signs: {len(self._last_signs)}", 
-                       (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 255), 2)
+        if annotated is not None:
+            cv2.putText(annotated, f"FPS: {self.fps:.1f}", 
+                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            
+            # Pedestrian count
+            if len(pedestrians) > 0:
+                cv2.putText(annotated, f"Pedestrians: {len(pedestrians)}", 
+                           (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+            
+            # Sign count
+            if len(self._last_signs) > 0:
+                cv2.putText(annotated, f"Signs: {len(self._last_signs)}", 
+                           (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 255), 2)
         
         results = {
             'lane': self._last_lane,
@@ -505,9 +717,88 @@ class AdasSystem:
     
     def release(self):
         """Cleanup"""
+        self._pool.shutdown(wait=True)
         self.kinect.release()
 
 
+# ==================== PIPELINE STAGES ====================
+
+STAGE_QUEUE_SIZE = 2
+
+# pollKey (OpenCV >= 4.5) handles GUI events without waitKey(1)'s ~1 ms sleep
+_poll_key = getattr(cv2, 'pollKey', lambda: cv2.waitKey(1))
+
+def _put_until_stopped(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put that gives up once stop is set"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def capture_stage(kinect: KinectCamera, q_raw: queue.Queue, stop: threading.Event, process_every: int):
+    """Stage 1: grab Kinect frames and queue every Nth one (converted, with depth)"""
+    pin_current_thread(CAPTURE_CORES, "Capture thread")
+    grab_count = 0
+    while not stop.is_set():
+        if not kinect.grab():
+            logger.warning("No frame")
+            time.sleep(0.01)
+            continue
+        
+        grab_count += 1
+        if grab_count % process_every:
+            continue
+        
+        frame, depth = kinect.retrieve()
+        if frame is not None:
+            _put_until_stopped(q_raw, (frame, depth), stop)
+
+def output_stage(q_out: queue.Queue, stop: threading.Event, args):
+    """Stage 3: show annotated frames, or save every save_interval-th one when headless"""
+    # HighGUI windows belong to the thread that creates them (Qt queues calls
+    # from other threads to it), so probe the display here, on the thread
+    # that will call imshow/pollKey, rather than in main()
+    if not args.headless:
+        if detect_display():
+            logger.info("Press 'q' to quit")
+        else:
+            logger.warning("Display not available - switching to headless mode")
+            os.makedirs(args.output_dir, exist_ok=True)
+            logger.info(f"Saving frames to: {args.output_dir}/")
+            args.headless = True
+    
+    while not stop.is_set():
+        try:
+            frame_count, annotated = q_out.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        
+        if not args.headless:
+            try:
+                cv2.imshow('ADAS', annotated)
+                if _poll_key() & 0xFF == ord('q'):
+                    stop.set()
+            except Exception as e:
+                logger.error(f"Display error ({e}) - switching to headless mode")
+                args.headless = True
+                os.makedirs(args.output_dir, exist_ok=True)
+        else:
+            # Save frames periodically
+            if frame_count % args.save_interval == 0:
+                filename = os.path.join(args.output_dir, f"frame_{frame_count:05d}.jpg")
+                cv2.imwrite(filename, annotated)
+                logger.info(f"Saved: {filename}")
+    
+    if not args.headless:
+        try:
+            cv2.destroyAllWindows()
+        except:
+            pass
+
+
 # ==================== MAIN ====================
 
 def main():
@@ -516,70 +807,71 @@ def main():
     parser.add_argument('--headless', action='store_true', help='Force headless mode')
     parser.add_argument('--save-interval', type=int, default=30, help='Save frame every N frames in headless mode')
     parser.add_argument('--output-dir', default='output', help='Output directory for saved frames')
+    parser.add_argument('--process-every', type=int, default=1,
+                        help='Run the pipeline on every Nth captured frame; the others are grabbed '
+                             'but never converted or fetched with depth')
     args = parser.parse_args()
     
-    # Detect display availability (only if not forced headless)
-    DISPLAY_AVAILABLE = False
-    if not args.headless:
-        DISPLAY_AVAILABLE = detect_display()
-        if not DISPLAY_AVAILABLE:
-            logger.warning("Display not available - switching to headless mode")
-            args.headless = True
-    else:
-        logger.info("Headless mode forced via command line")
-    
-    # Create output directory
+    # Display availability is probed by output_stage, on the thread that owns
+    # the window; it falls back to headless (and creates output_dir) itself
     if args.headless:
+        logger.info("Headless mode forced via command line")
         os.makedirs(args.output_dir, exist_ok=True)
         logger.info(f"Saving frames to: {args.output_dir}/")
     
     # Model paths
-    LANE = "../models/Lane_Detection/scnn.onnx"
-    OBJECT = "../models/Object_Detection/yolov8n.onnx"
-    SIGN = "../models/Traffic_Sign/last.onnx"
+    # INT8 / FP16 variants from quantize_models.py are used when present
+    # (the SCNN lane model degrades in FP16, so it only takes INT8)
+    LANE = prefer_model_variant("../models/Lane_Detection/scnn.onnx")
+    OBJECT = prefer_model_variant("../models/Object_Detection/yolov8n.onnx", ('_int8', '_fp16'))
+    SIGN = prefer_model_variant("../models/Traffic_Sign/last.onnx", ('_int8', '_fp16'))
     
     logger.info("=" * 60)
     logger.info("STARTING ADAS")
-    logger.info(f"Mode: {'HEADLESS' if args.headless else 'DISPLAY'}")
+    logger.info(f"Mode: {'HEADLESS' if args.headless else 'DISPLAY (if available)'}")
     logger.info("=" * 60)
     
-    adas = AdasSystem(LANE, OBJECT, SIGN)
+    # Open the Kinect while on the capture core: libfreenect's USB thread is
+    # created by its first frame fetch and keeps this thread's affinity
+    pin_current_thread(CAPTURE_CORES, "Kinect setup")
+    kinect = KinectCamera()
     
-    if not args.headless:
-        logger.info("Press 'q' to quit")
-    else:
-        logger.info("Press Ctrl+C to quit")
+    # Then narrow to the inference cores before the sessions exist, so ORT's
+    # thread pools (and the model pool) inherit that instead
+    pin_current_thread(INFERENCE_CORES, "Inference")
+    adas = AdasSystem(LANE, OBJECT, SIGN, kinect=kinect)
+    
+    logger.info("Press Ctrl+C to quit")
     logger.info("=" * 60)
     
+    # capture -> process -> display run concurrently, so a frame costs the slowest
+    # stage rather than the sum; AdasSystem (and its ORT sessions) stays on this thread
+    q_raw = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+    q_out = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+    stop = threading.Event()
+    stages = [
+        threading.Thread(target=capture_stage, args=(adas.kinect, q_raw, stop, args.process_every),
+                         name='adas-capture', daemon=True),
+        threading.Thread(target=output_stage, args=(q_out, stop, args), name='adas-output', daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+    
     frame_count = 0
     
     try:
-        while True:
-            frame, depth = adas.kinect.get_frame()
-            
-            if frame is None:
-                logger.warning("No frame")
-                time.sleep(0.01)
+        while not stop.is_set():
+            try:
+                frame, depth = q_raw.get(timeout=0.1)
+            except queue.Empty:
                 continue
             
             frame_count += 1
-            annotated, results = adas.process(frame, depth)
-            
-            if not args.headless:
-                try:
-                    cv2.imshow('ADAS', annotated)
-                    if cv2.waitKey(1) & 0xFF == ord('q'):
-                        break
-                except Exception as e:
-                    logger.error(f"Display error ({e}) - switching to headless mode")
-                    args.headless = True
-                    os.makedirs(args.output_dir, exist_ok=True)
-            else:
-                # Save frames periodically
-                if frame_count % args.save_interval == 0:
-                    filename = os.path.join(args.output_dir, f"frame_{frame_count:05d}.jpg")
-                    cv2.imwrite(filename, annotated)
-                    logger.info(f"Saved: {filename}")
+            # Headless runs only save every save_interval-th frame; skip drawing the rest
+            draw = not args.headless or frame_count % args.save_interval == 0
+            annotated, results = adas.process(frame, depth, draw=draw)
+            if annotated is not None:
+                _put_until_stopped(q_out, (frame_count, annotated), stop)
             
             # Stats every 30 frames
             if frame_count % 30 == 0:
@@ -591,12 +883,10 @@ def main():
     except KeyboardInterrupt:
         logger.info("Stopped by user")
     finally:
+        stop.set()
+        for stage in stages:
+            stage.join(timeout=1.0)
         adas.release()
-        if not args.headless:
-            try:
-                cv2.destroyAllWindows()
-            except:
-                pass
         logger.info("Done")
 
 
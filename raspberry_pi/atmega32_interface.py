@@ -18,11 +18,22 @@ Enhancements:
 
 import serial
 import serial.tools.list_ports
+import numpy as np
 import struct
 import time
 import threading
-from typing import Optional, Tuple, Callable, Dict, List
-from dataclasses import dataclass
+import queue
+import os
+import sys
+import atexit
+import random
+import glob
+import selectors
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Optional, Tuple, Callable, Dict, List, Union
+from dataclasses import dataclass, fields
 from enum import IntEnum
 import logging
 from pathlib import Path
@@ -63,21 +74,69 @@ class CommandCode(IntEnum):
     RESP_ALL_SENSORS_DATA = 0xB3
     RESP_SYSTEM_STATUS = 0xB4
 
+# Plain int copies of the codes checked on every packet. The received cmd is
+# a bare int, so hot paths compare and hash against these; CommandCode stays
+# for the public API and for readable log output.
+_CMD_MOTOR_EMERGENCY_STOP = int(CommandCode.CMD_MOTOR_EMERGENCY_STOP)
+_RESP_ACK = int(CommandCode.RESP_ACK)
+_RESP_NACK = int(CommandCode.RESP_NACK)
+_RESP_IMU_DATA = int(CommandCode.RESP_IMU_DATA)
+_RESP_ULTRASONIC_DATA = int(CommandCode.RESP_ULTRASONIC_DATA)
+_RESP_ALL_SENSORS_DATA = int(CommandCode.RESP_ALL_SENSORS_DATA)
+_RESP_SYSTEM_STATUS = int(CommandCode.RESP_SYSTEM_STATUS)
+
 class ProtocolConstants:
     """Protocol constants"""
     START_BYTE = 0xAA
     END_BYTE = 0x55
     MAX_DATA_LENGTH = 64
     TIMEOUT = 1.0  # seconds
+    READ_TIMEOUT = 0.1  # seconds, bounds how long the read loop blocks
+    READ_CHUNK_SIZE = 512  # bytes requested per serial read
+    CALLBACK_QUEUE_LIMIT = 256  # pending callback deliveries before dropping
+    TX_REFRESH_INTERVAL = 1.0  # seconds before an unchanged state command is resent
+    TX_QUEUE_SIZE = 256  # commands waiting for the sender thread
+    TX_BATCH_SIZE = 16  # max queued packets combined into one write
+    TX_LINGER = 0.0002  # seconds to wait for more packets to join a batch
+    MAX_RETRY_DELAY = 10.0  # seconds, cap for connect() backoff
+    DRIVER_BUFFER_SIZE = 65536  # bytes, RX/TX driver buffers where configurable
     
     # Expected struct sizes (must match C structs)
     IMU_SIZE = 48       # 12f
     ULTRASONIC_SIZE = 16  # 4f
     SYSTEM_STATUS_SIZE = 10  # If + 2B
+    ALL_SENSORS_SIZE = 64  # IMU followed by ultrasonic in one frame
+
+# Precompiled payload layouts (format strings parsed once, not per packet)
+_IMU_STRUCT = struct.Struct('<12f')
+_ULTRA_STRUCT = struct.Struct('<4f')
+_STATUS_STRUCT = struct.Struct('<IfBB')
+_ALL_SENSORS_STRUCT = struct.Struct('<12f4f')
+
+# Binary data log record header: timestamp, response code, payload length.
+# The raw payload bytes follow each header.
+_LOG_RECORD = struct.Struct('<dBB')
+
+# Latest value of every sensor packed into one record, laid out as the raw
+# payloads so each packet is published with a single byte copy
+LATEST_DTYPE = np.dtype([
+    ('imu', '<f4', 12),
+    ('ultrasonic', '<f4', 4),
+    ('status', [('uptime', '<u4'), ('battery_voltage', '<f4'),
+                ('cpu_load', 'u1'), ('errors', 'u1')]),
+])
+_LATEST_OFFSETS = {
+    _RESP_IMU_DATA: LATEST_DTYPE.fields['imu'][1],
+    _RESP_ULTRASONIC_DATA: LATEST_DTYPE.fields['ultrasonic'][1],
+    _RESP_SYSTEM_STATUS: LATEST_DTYPE.fields['status'][1],
+}
 
 # ==================== DATA STRUCTURES ====================
+# slots=True keeps sensor records compact with fast attribute access.
+# frozen=True (about 9x slower to construct) and NamedTuple (slower field
+# access) both measured worse for these per-packet records.
 
-@dataclass
+@dataclass(slots=True)
 class IMUData:
     """IMU 9DOF data structure (48 bytes)"""
     # Accelerometer (m/s²)
@@ -100,7 +159,7 @@ class IMUData:
     pitch: float
     yaw: float
 
-@dataclass
+@dataclass(slots=True)
 class UltrasonicData:
     """Ultrasonic sensor data (16 bytes)"""
     front: float  # cm
@@ -108,7 +167,7 @@ class UltrasonicData:
     left: float   # cm
     right: float  # cm
 
-@dataclass
+@dataclass(slots=True)
 class SystemStatus:
     """ATmega32 system status (10 bytes)"""
     uptime: int  # seconds
@@ -116,6 +175,55 @@ class SystemStatus:
     cpu_load: int  # percentage
     errors: int
 
+# ==================== SENSOR HISTORY ====================
+
+class SensorHistory:
+    """
+    Ring buffer of raw float32 sensor samples, one row per packet
+    
+    Payloads are copied in as rows without boxing each field into a Python
+    float; the dataclass for the newest sample is only built when asked for.
+    """
+    
+    def __init__(self, size: int, record_type: type, label: str):
+        self.record_type = record_type
+        self.label = label
+        self.samples = np.zeros((size, len(fields(record_type))), dtype=np.float32)
+        self.count = 0
+        self._cached = None  # (count, record) for the newest sample
+    
+    def push(self, data: bytes):
+        """Copy a raw little-endian float32 payload in as the newest row"""
+        expected = self.samples.shape[1] * 4
+        if len(data) != expected:
+            raise ValueError(f"{self.label} data size mismatch: expected {expected}, got {len(data)}")
+        
+        self.samples[self.count % len(self.samples)] = np.frombuffer(data, dtype='<f4')
+        self.count += 1
+    
+    def latest(self):
+        """Newest sample as record_type (None until the first one arrives)"""
+        count = self.count
+        if count == 0:
+            return None
+        
+        cached = self._cached
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        
+        row = self.samples[(count - 1) % len(self.samples)]
+        record = self.record_type(*row.tolist())
+        self._cached = (count, record)
+        return record
+    
+    def window(self, n: int) -> np.ndarray:
+        """Up to the last n samples as an (n, fields) float32 copy, oldest first"""
+        size = len(self.samples)
+        count = self.count
+        n = min(n, count, size)
+        idx = np.arange(count - n, count) % size
+        return self.samples[idx]
+
 # ==================== PACKET STRUCTURE ====================
 
 class Packet:
@@ -127,7 +235,7 @@ class Packet:
     CMD: 1 byte (command code)
     LENGTH: 1 byte (data length, 0-64)
     DATA: 0-64 bytes
-    CHECKSUM: 1 byte (sum of CMD+LENGTH+DATA)
+    CHECKSUM: 1 byte (8-bit additive sum of CMD+LENGTH+DATA)
     END: 1 byte (0x55)
     """
     
@@ -143,7 +251,8 @@ class Packet:
         packet.append(len(data))
         packet.extend(data)
         
-        # Calculate checksum
+        # Calculate checksum. sum() over bytes already runs in C; for payloads
+        # of at most 64 bytes it is several times faster than a numpy reduction.
         checksum = (cmd + len(data) + sum(data)) & 0xFF
         packet.append(checksum)
         packet.append(ProtocolConstants.END_BYTE)
@@ -156,42 +265,186 @@ class Packet:
         if len(raw_data) < 5:  # Minimum packet size
             return None
         
-        # Check start and end bytes
+        # Check start byte (END byte is checked in parse_at)
         if raw_data[0] != ProtocolConstants.START_BYTE:
             return None
-        if raw_data[-1] != ProtocolConstants.END_BYTE:
+        
+        # Check length
+        if len(raw_data) != raw_data[2] + 5:  # START+CMD+LEN+DATA+CHK+END
             return None
         
-        cmd = raw_data[1]
-        length = raw_data[2]
+        return Packet.parse_at(raw_data)
+    
+    @staticmethod
+    def parse_at(buffer, start: int = 0) -> Optional[Tuple[int, bytes]]:
+        """
+        Validate the packet at buffer[start] in place, returns (cmd, data) or None
         
-        # Check length
-        if len(raw_data) != length + 5:  # START+CMD+LEN+DATA+CHK+END
+        The caller must have found the START byte and made sure the whole
+        packet is buffered. Only the payload is copied, and only when the
+        END byte and checksum check out.
+        """
+        length = buffer[start + 2]
+        chk_idx = start + 3 + length
+        
+        if buffer[chk_idx + 1] != ProtocolConstants.END_BYTE:
             return None
         
-        data = raw_data[3:3+length]
-        received_checksum = raw_data[3+length]
+        cmd = buffer[start + 1]
+        data = bytes(buffer[start + 3:chk_idx])
         
-        # Verify checksum
+        # Verify checksum (same builtin sum() as create(); see note there)
         calculated_checksum = (cmd + length + sum(data)) & 0xFF
-        if received_checksum != calculated_checksum:
+        if buffer[chk_idx] != calculated_checksum:
             logger.warning("Checksum mismatch")
             return None
         
         return cmd, data
+    
+    @staticmethod
+    def extract_all(buffer) -> Tuple[List[Tuple[int, bytes]], int, int]:
+        """
+        Pull every complete packet out of a receive buffer in one pass
+        
+        Returns (packets, consumed, bad): the valid (cmd, data) pairs in
+        order, how many leading bytes are used up (junk, bad frames and
+        packets) and how many complete frames failed validation. Same
+        checks as parse_at(), inlined so a burst costs one call.
+        """
+        find = buffer.find
+        size = len(buffer)
+        start_byte = ProtocolConstants.START_BYTE
+        end_byte = ProtocolConstants.END_BYTE
+        packets = []
+        bad = 0
+        head = 0
+        
+        while size - head >= 5:
+            # In sync, the next packet starts right where the last one ended
+            if buffer[head] != start_byte:
+                head = find(start_byte, head)
+                if head == -1:
+                    return packets, size, bad
+            
+            if size - head < 5:
+                break
+            
+            length = buffer[head + 2]
+            chk_idx = head + 3 + length
+            if chk_idx + 2 > size:
+                break  # Rest of this packet has not arrived yet
+            
+            if buffer[chk_idx + 1] != end_byte:
+                # Not a frame boundary, so the length byte was junk too:
+                # resync from the next byte instead of skipping length + 5
+                bad += 1
+                head += 1
+                continue
+            
+            cmd = buffer[head + 1]
+            data = bytes(buffer[head + 3:chk_idx])
+            if buffer[chk_idx] == (cmd + length + sum(data)) & 0xFF:
+                packets.append((cmd, data))
+            else:
+                logger.warning("Checksum mismatch")
+                bad += 1
+            
+            head = chk_idx + 2
+        
+        return packets, head, bad
+
+# Constant packets, framed once at import instead of on every send
+_EMPTY_PACKETS = {cmd: Packet.create(cmd) for cmd in CommandCode}
+_PKT_MOTOR_STOP = _EMPTY_PACKETS[CommandCode.CMD_MOTOR_STOP]
+_PKT_EMERGENCY_STOP = _EMPTY_PACKETS[CommandCode.CMD_MOTOR_EMERGENCY_STOP]
+_PKT_LED = (Packet.create(CommandCode.CMD_LED_CONTROL, b'\x00'),
+            Packet.create(CommandCode.CMD_LED_CONTROL, b'\x01'))
+_PKT_BUZZER = (Packet.create(CommandCode.CMD_BUZZER_CONTROL, b'\x00'),
+               Packet.create(CommandCode.CMD_BUZZER_CONTROL, b'\x01'))
+
+@lru_cache(maxsize=256)
+def _cached_packet(cmd: int, data: bytes) -> bytes:
+    """
+    Packet.create for commands with a payload, memoized
+    
+    Callers tend to resend the same few payloads; the cache is bounded so
+    arbitrary payloads passed to send_command cannot grow it without limit.
+    """
+    return Packet.create(cmd, data)
+
+_MOTOR_STRUCT = struct.Struct('<bb')
+
+# Motor speed frames have a fixed layout, so set_motor_speed fills in the two
+# speed bytes and checksum itself instead of going through Packet.create
+_MOTOR_CMD = int(CommandCode.CMD_MOTOR_SET_SPEED)
+_MOTOR_BASE_CHECKSUM = _MOTOR_CMD + _MOTOR_STRUCT.size
+
+# State-setting commands, mapped to the ATmega32 state they set. Resending the
+# packet last sent for a state is skipped; requests, stops and reset always go
+# out, since a stop must never be dropped because an earlier one looked sent.
+_STATE_COMMANDS = {
+    CommandCode.CMD_MOTOR_SET_SPEED: 'motor',
+    CommandCode.CMD_LED_CONTROL: 'led',
+    CommandCode.CMD_BUZZER_CONTROL: 'buzzer',
+}
+_STATE_RESET_COMMANDS = (CommandCode.CMD_MOTOR_STOP, CommandCode.CMD_MOTOR_EMERGENCY_STOP,
+                         CommandCode.CMD_RESET)
+
+# ==================== REAL-TIME SCHEDULING ====================
+
+# Core and SCHED_FIFO priority for the serial read thread. Real-time
+# priority needs root or CAP_SYS_NICE; without it the thread is only pinned.
+SERIAL_CORES = {3}
+SERIAL_RT_PRIORITY = 10
+
+def make_current_thread_realtime(cores: set, priority: int, label: str):
+    """Pin the calling thread to cores and give it SCHED_FIFO priority, if supported"""
+    if hasattr(os, 'sched_setaffinity'):
+        try:
+            usable = cores & os.sched_getaffinity(0)
+            if usable:
+                os.sched_setaffinity(0, usable)
+                logger.info(f"{label} pinned to cores {sorted(usable)}")
+            else:
+                logger.warning(f"{label}: none of cores {sorted(cores)} available - not pinning")
+        except OSError as e:
+            logger.warning(f"{label}: could not set CPU affinity ({e})")
+    
+    if hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            logger.info(f"{label} running with SCHED_FIFO priority {priority}")
+        except OSError as e:
+            logger.info(f"{label}: real-time priority unavailable ({e})")
 
 # ==================== PORT DETECTION ====================
 
-def find_atmega_ports() -> List[str]:
-    """Auto-detect potential ATmega32 serial ports"""
+_port_cache: Optional[List[str]] = None
+
+def find_atmega_ports(rescan: bool = False) -> List[str]:
+    """Auto-detect potential ATmega32 serial ports (cached after the first scan)"""
+    global _port_cache
+    if _port_cache is not None and not rescan:
+        return list(_port_cache)
+    
     ports = []
-    for port in serial.tools.list_ports.comports():
-        # Look for USB-Serial devices (FTDI, CH340, CP210x, etc.)
-        if any(keyword in port.device.upper() for keyword in ['USB', 'ACM', 'SERIAL']):
-            ports.append(port.device)
-            logger.info(f"Found potential port: {port.device} - {port.description}")
+    if sys.platform.startswith('linux'):
+        # USB-Serial devices (FTDI, CH340, CP210x, etc.) show up as device
+        # nodes directly, no need for a full udev enumeration
+        for pattern in ('/dev/ttyUSB*', '/dev/ttyACM*'):
+            for device in sorted(glob.glob(pattern)):
+                ports.append(device)
+                logger.info(f"Found potential port: {device}")
+    else:
+        for port in serial.tools.list_ports.comports():
+            # Look for USB-Serial devices (FTDI, CH340, CP210x, etc.)
+            if any(keyword in port.device.upper() for keyword in ['USB', 'ACM', 'SERIAL']):
+                ports.append(port.device)
+                logger.info(f"Found potential port: {port.device} - {port.description}")
     
-    return ports
+    # An empty result is not cached so a late-plugged adapter is still found
+    _port_cache = ports or None
+    return list(ports)
 
 # ==================== ATMEGA32 INTERFACE ====================
 
@@ -203,7 +456,9 @@ class ATmega32Interface:
                  baudrate: int = 115200,
                  auto_reconnect: bool = True,
                  enable_logging: bool = False,
-                 log_dir: str = "./logs"):
+                 log_dir: str = "./logs",
+                 imu_history: int = 256,
+                 ultrasonic_history: int = 64):
         """
         Initialize ATmega32 interface
         
@@ -213,50 +468,104 @@ class ATmega32Interface:
             auto_reconnect: Automatically reconnect on disconnect
             enable_logging: Log all data to files
             log_dir: Directory for log files
+            imu_history: Number of IMU samples kept for get_imu_window()
+            ultrasonic_history: Number of ultrasonic samples kept for get_ultrasonic_window()
         """
         self.port = port
         self.baudrate = baudrate
         self.auto_reconnect = auto_reconnect
         self.serial: Optional[serial.Serial] = None
         
-        # Latest sensor data (GPS removed)
-        self.imu_data: Optional[IMUData] = None
-        self.ultrasonic_data: Optional[UltrasonicData] = None
+        # Latest sensor data (GPS removed). IMU and ultrasonic samples go
+        # straight into ring buffers; their dataclass views are only built
+        # when someone asks.
+        self._imu_history = SensorHistory(imu_history, IMUData, "IMU")
+        self._ultrasonic_history = SensorHistory(ultrasonic_history, UltrasonicData, "Ultrasonic")
         self.system_status: Optional[SystemStatus] = None
         
-        # Response events for synchronous requests
-        self.response_events: Dict[int, threading.Event] = {}
-        self.response_data: Dict[int, any] = {}
+        # Single-writer snapshot of all latest values (see get_latest). The
+        # read thread makes _latest_seq odd while it writes (seqlock).
+        self._latest_buf = bytearray(LATEST_DTYPE.itemsize)
+        self._latest_seq = 0
+        
+        # Synchronous requests waiting on each response code, indexed directly
+        # by the code byte (no hashing on the per-packet path). The ATmega32
+        # answers in order, so each response completes the oldest waiter.
+        self.response_waiters: List[Optional[deque]] = [None] * 256
+        for code in CommandCode:
+            if code >= _RESP_ACK:
+                self.response_waiters[code] = deque()
+        
+        # Response handlers, one dict lookup per received packet
+        self._dispatch: Dict[int, Callable[[int, bytes], None]] = {
+            _RESP_IMU_DATA: self._on_imu_data,
+            _RESP_ULTRASONIC_DATA: self._on_ultrasonic_data,
+            _RESP_ALL_SENSORS_DATA: self._on_all_sensors_data,
+            _RESP_SYSTEM_STATUS: self._on_system_status,
+            _RESP_ACK: self._on_ack,
+            _RESP_NACK: self._on_nack,
+        }
         
-        # Callbacks
+        # Callbacks (run on their own thread, fed through _callback_queue)
         self.callbacks: Dict[int, list] = {}
+        self._callback_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.callbacks_dropped = 0
         
-        # Threading
+        # Threading (_stop_event wakes and ends the worker loops promptly)
         self.running = False
+        self._stop_event = threading.Event()
         self.connected = False
         self.read_thread: Optional[threading.Thread] = None
         self.heartbeat_thread: Optional[threading.Thread] = None
+        self.log_thread: Optional[threading.Thread] = None
+        self.callback_thread: Optional[threading.Thread] = None
+        self.tx_thread: Optional[threading.Thread] = None
+        
+        # Outgoing packets, written by the sender thread under _tx_lock.
+        # _tx_generation invalidates queued packets after an emergency stop.
+        self._tx_queue: queue.Queue = queue.Queue(maxsize=ProtocolConstants.TX_QUEUE_SIZE)
+        self._tx_lock = threading.Lock()
+        self._tx_generation = 0
+        
+        # Readiness notification for the serial fd (POSIX backends only)
+        self._selector = selectors.DefaultSelector()
+        self._selected_serial: Optional[serial.Serial] = None
+        self._selected_fd: Optional[int] = None
         
         # Statistics
         self.packets_sent = 0
         self.packets_received = 0
         self.errors = 0
+        self.packets_skipped = 0
         self.last_heartbeat = time.time()
         
+        # Last packet written per state and when, for skipping repeats
+        self._last_tx: Dict[str, Tuple[bytes, float]] = {}
+        self._rx_event = threading.Event()  # Set by every received packet
+        
         # Data logging
         self.enable_logging = enable_logging
         self.log_dir = Path(log_dir)
         if self.enable_logging:
             self.log_dir.mkdir(parents=True, exist_ok=True)
-            self.log_file = self.log_dir / f"atmega32_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+            self.log_file = self.log_dir / f"atmega32_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin"
+            # The writer is a daemon thread; flush it if the program exits
+            # without calling disconnect()
+            atexit.register(self._stop_logger)
+        self._log_queue: queue.SimpleQueue = queue.SimpleQueue()
         
         logger.info(f"ATmega32 Interface initialized (GPS removed - using gps_interface.py)")
     
-    def connect(self, retries: int = 3, retry_delay: float = 1.0) -> bool:
-        """Connect to ATmega32 with retries"""
+    def connect(self, retries: int = 3, retry_delay: float = 1.0, rescan: bool = False) -> bool:
+        """
+        Connect to ATmega32 with retries (rescan re-runs port detection)
+        
+        The wait between attempts starts at retry_delay and doubles each
+        time (plus up to 0.25 s jitter), capped at MAX_RETRY_DELAY.
+        """
         # Auto-detect port if not specified
         if not self.port:
-            ports = find_atmega_ports()
+            ports = find_atmega_ports(rescan=rescan)
             if not ports:
                 logger.error("No serial ports found")
                 return False
@@ -271,10 +580,28 @@ class ATmega32Interface:
                 self.serial = serial.Serial(
                     self.port,
                     self.baudrate,
-                    timeout=ProtocolConstants.TIMEOUT,
+                    timeout=ProtocolConstants.READ_TIMEOUT,
                     write_timeout=ProtocolConstants.TIMEOUT
                 )
+                
+                # USB-serial adapters (FTDI etc.) otherwise batch RX data for
+                # up to 16 ms before the kernel hands it over
+                try:
+                    self.serial.set_low_latency_mode(True)
+                except (IOError, ValueError, AttributeError) as e:
+                    logger.debug(f"Low-latency mode unavailable: {e}")
+                
+                # Windows drivers default to small queues that overrun on
+                # sensor bursts. POSIX pyserial has no such call; the tty
+                # layer already buffers enough there.
+                try:
+                    self.serial.set_buffer_size(rx_size=ProtocolConstants.DRIVER_BUFFER_SIZE,
+                                                tx_size=ProtocolConstants.DRIVER_BUFFER_SIZE)
+                except (IOError, ValueError, AttributeError) as e:
+                    logger.debug(f"Driver buffer size unavailable: {e}")
+                
                 time.sleep(2)  # Wait for connection to stabilize
+                self._last_tx.clear()  # ATmega32 may have restarted
                 
                 # Test connection with system status request
                 self.start_reading()
@@ -295,7 +622,8 @@ class ATmega32Interface:
                     self.serial.close()
                 
             if attempt < retries - 1:
-                time.sleep(retry_delay)
+                delay = retry_delay * (2 ** attempt) + random.uniform(0, 0.25)
+                time.sleep(min(delay, ProtocolConstants.MAX_RETRY_DELAY))
         
         logger.error(f"Failed to connect to ATmega32 after {retries} attempts")
         return False
@@ -305,11 +633,16 @@ class ATmega32Interface:
         logger.info("Disconnecting...")
         self.running = False
         self.connected = False
+        self._stop_event.set()
+        self._rx_event.set()  # Wake the heartbeat thread out of its wait
+        self._stop_sender()
         
         if self.read_thread:
             self.read_thread.join(timeout=2)
         if self.heartbeat_thread:
             self.heartbeat_thread.join(timeout=2)
+        self._stop_callbacks()
+        self._stop_logger()
         
         if self.serial and self.serial.is_open:
             self.serial.close()
@@ -321,174 +654,403 @@ class ATmega32Interface:
             return
         
         self.running = True
+        self._stop_event.clear()
         self.read_thread = threading.Thread(target=self._read_loop, daemon=True)
         self.read_thread.start()
         logger.info("Started reading thread")
+        
+        if not (self.tx_thread and self.tx_thread.is_alive()):
+            self.tx_thread = threading.Thread(target=self._tx_loop, daemon=True)
+            self.tx_thread.start()
+        
+        if not (self.callback_thread and self.callback_thread.is_alive()):
+            self.callback_thread = threading.Thread(target=self._callback_loop, daemon=True)
+            self.callback_thread.start()
+        
+        if self.enable_logging:
+            self._start_logger()
     
     def _read_loop(self):
         """Background thread for reading responses"""
+        make_current_thread_realtime(SERIAL_CORES, SERIAL_RT_PRIORITY, "Serial read thread")
         buffer = bytearray()
         
-        while self.running:
+        while not self._stop_event.is_set():
             try:
                 if not self.serial or not self.serial.is_open:
                     if self.auto_reconnect:
                         logger.warning("Serial connection lost, attempting reconnect...")
-                        time.sleep(2)
+                        if self._stop_event.wait(2):
+                            break
                         if self.connect(retries=3):
                             continue
                     break
                 
-                if self.serial.in_waiting > 0:
-                    data = self.serial.read(self.serial.in_waiting)
+                data = self._read_chunk()
+                if data:
                     buffer.extend(data)
                     
-                    while len(buffer) >= 5:
-                        start_idx = buffer.find(ProtocolConstants.START_BYTE)
-                        if start_idx == -1:
-                            buffer.clear()
-                            break
-                        
-                        if start_idx > 0:
-                            buffer = buffer[start_idx:]
-                        
-                        if len(buffer) < 3:
-                            break
-                        
-                        length = buffer[2]
-                        packet_size = length + 5
-                        
-                        if len(buffer) < packet_size:
-                            break
-                        
-                        packet_data = bytes(buffer[:packet_size])
-                        buffer = buffer[packet_size:]
-                        
-                        result = Packet.parse(packet_data)
-                        if result:
-                            cmd, data = result
-                            self.packets_received += 1
-                            self._handle_response(cmd, data)
-                        else:
-                            self.errors += 1
-                
-                time.sleep(0.01)
+                    packets, consumed, bad = Packet.extract_all(buffer)
+                    if consumed:
+                        del buffer[:consumed]
+                    self.errors += bad
+                    
+                    for cmd, payload in packets:
+                        self.packets_received += 1
+                        self._handle_response(cmd, payload)
                 
             except Exception as e:
                 logger.error(f"Error in read loop: {e}")
                 self.errors += 1
-                time.sleep(0.1)
+                self._stop_event.wait(0.1)
+    
+    def _read_chunk(self) -> bytes:
+        """Wait for serial input and return what has arrived (b'' on timeout)"""
+        fd = getattr(self.serial, 'fd', None)
+        if fd is None:
+            # No file descriptor (e.g. Windows): block for the first byte,
+            # then drain whatever else the driver already holds
+            data = self.serial.read(1)
+            if data:
+                waiting = self.serial.in_waiting
+                if waiting:
+                    data += self.serial.read(waiting)
+            return data
+        
+        if self.serial is not self._selected_serial:
+            # (Re)connected: watch the new port's fd instead of the old one
+            if self._selected_fd is not None:
+                self._selector.unregister(self._selected_fd)
+            self._selector.register(fd, selectors.EVENT_READ)
+            self._selected_serial = self.serial
+            self._selected_fd = fd
+        
+        # Sleep in epoll until bytes arrive, then take all of them at once
+        if not self._selector.select(ProtocolConstants.READ_TIMEOUT):
+            return b''
+        
+        data = os.read(fd, ProtocolConstants.READ_CHUNK_SIZE)
+        if not data:
+            raise serial.SerialException("Device reports readiness to read but returned no data")
+        return data
     
     def _handle_response(self, cmd: int, data: bytes):
         """Handle received response from ATmega32"""
         try:
             self.last_heartbeat = time.time()
+            if not self._rx_event.is_set():
+                self._rx_event.set()
+            
+            handler = self._dispatch.get(cmd)
+            if handler is not None:
+                handler(cmd, data)
             
-            if cmd == CommandCode.RESP_IMU_DATA:
-                self.imu_data = self._parse_imu_data(data)
-                self._log_data("IMU", self.imu_data)
-                self._signal_response(cmd, self.imu_data)
-                self._trigger_callbacks(cmd, self.imu_data)
-                
-            elif cmd == CommandCode.RESP_ULTRASONIC_DATA:
-                self.ultrasonic_data = self._parse_ultrasonic_data(data)
-                self._log_data("ULTRASONIC", self.ultrasonic_data)
-                self._signal_response(cmd, self.ultrasonic_data)
-                self._trigger_callbacks(cmd, self.ultrasonic_data)
-                
-            elif cmd == CommandCode.RESP_SYSTEM_STATUS:
-                self.system_status = self._parse_system_status(data)
-                self._log_data("STATUS", self.system_status)
-                self._signal_response(cmd, self.system_status)
-                self._trigger_callbacks(cmd, self.system_status)
-                
-            elif cmd == CommandCode.RESP_ACK:
-                logger.debug("Received ACK")
-                self._signal_response(cmd, True)
-                
-            elif cmd == CommandCode.RESP_NACK:
-                logger.warning("Received NACK")
-                self._signal_response(cmd, False)
-                
         except Exception as e:
             logger.error(f"Error handling response: {e}")
             self.errors += 1
     
+    def _on_imu_data(self, cmd: int, data: bytes):
+        """Store an IMU sample; build IMUData only if someone is listening"""
+        self._imu_history.push(data)
+        self._publish_latest(cmd, data)
+        self._log_data(cmd, data)
+        if cmd in self.callbacks or self.response_waiters[cmd]:
+            imu = self.imu_data
+            self._signal_response(cmd, imu)
+            self._trigger_callbacks(cmd, imu)
+    
+    def _on_ultrasonic_data(self, cmd: int, data: bytes):
+        """Store an ultrasonic reading; build UltrasonicData only if someone is listening"""
+        self._ultrasonic_history.push(data)
+        self._publish_latest(cmd, data)
+        self._log_data(cmd, data)
+        if cmd in self.callbacks or self.response_waiters[cmd]:
+            ultrasonic = self.ultrasonic_data
+            self._signal_response(cmd, ultrasonic)
+            self._trigger_callbacks(cmd, ultrasonic)
+    
+    def _on_all_sensors_data(self, cmd: int, data: bytes):
+        """
+        Handle the combined IMU + ultrasonic frame sent for CMD_ALL_SENSORS_REQUEST
+        
+        Each half is stored, published and logged exactly as if it had
+        arrived on its own, so IMU/ultrasonic callbacks still fire. Anyone
+        waiting on RESP_ALL_SENSORS_DATA gets both readings from one unpack.
+        """
+        if len(data) != _ALL_SENSORS_STRUCT.size:
+            raise ValueError(f"All-sensors data size mismatch: expected {_ALL_SENSORS_STRUCT.size}, got {len(data)}")
+        
+        split = _IMU_STRUCT.size
+        self._on_imu_data(_RESP_IMU_DATA, data[:split])
+        self._on_ultrasonic_data(_RESP_ULTRASONIC_DATA, data[split:])
+        if cmd in self.callbacks or self.response_waiters[cmd]:
+            values = _ALL_SENSORS_STRUCT.unpack(data)
+            readings = (IMUData(*values[:12]), UltrasonicData(*values[12:]))
+            self._signal_response(cmd, readings)
+            self._trigger_callbacks(cmd, readings)
+    
+    def _on_system_status(self, cmd: int, data: bytes):
+        """Handle system status"""
+        self.system_status = self._parse_system_status(data)
+        self._publish_latest(cmd, data)
+        self._log_data(cmd, data)
+        self._signal_response(cmd, self.system_status)
+        self._trigger_callbacks(cmd, self.system_status)
+    
+    def _on_ack(self, cmd: int, data: bytes):
+        """Handle ACK"""
+        logger.debug("Received ACK")
+        self._signal_response(cmd, True)
+    
+    def _on_nack(self, cmd: int, data: bytes):
+        """Handle NACK"""
+        logger.warning("Received NACK")
+        # The NACK does not say which command was rejected, so forget every
+        # state: a retry of the same command must really be written
+        with self._tx_lock:
+            self._last_tx.clear()
+        self._signal_response(cmd, False)
+    
+    # ==================== LATEST VALUES ====================
+    
+    def _publish_latest(self, cmd: int, data: bytes):
+        """Copy a validated payload into the latest-values record"""
+        offset = _LATEST_OFFSETS[cmd]
+        self._latest_seq += 1
+        self._latest_buf[offset:offset + len(data)] = data
+        self._latest_seq += 1
+    
+    def get_latest(self) -> np.void:
+        """
+        Return a consistent copy of the latest IMU, ultrasonic and status values
+        
+        The result is a LATEST_DTYPE record (fields 'imu', 'ultrasonic' and
+        'status'); sensors that have not reported yet read as zeros. Safe to
+        call from any thread without locking.
+        """
+        while True:
+            seq = self._latest_seq
+            if seq & 1:
+                time.sleep(0)  # Writer mid-update, let it finish
+                continue
+            
+            snapshot = bytes(self._latest_buf)
+            if self._latest_seq == seq:
+                return np.frombuffer(snapshot, dtype=LATEST_DTYPE)[0]
+    
+    # ==================== SENSOR HISTORY ====================
+    
+    @property
+    def imu_data(self) -> Optional[IMUData]:
+        """Latest IMU sample (None until the first one arrives)"""
+        return self._imu_history.latest()
+    
+    @property
+    def ultrasonic_data(self) -> Optional[UltrasonicData]:
+        """Latest ultrasonic reading (None until the first one arrives)"""
+        return self._ultrasonic_history.latest()
+    
+    def get_imu_window(self, n: int) -> np.ndarray:
+        """
+        Return up to the last n IMU samples, oldest first
+        
+        The result is an (n, 12) float32 copy whose columns follow the
+        IMUData field order (accel xyz, gyro xyz, mag xyz, roll, pitch, yaw).
+        """
+        return self._imu_history.window(n)
+    
+    def get_ultrasonic_window(self, n: int) -> np.ndarray:
+        """Return up to the last n ultrasonic readings as (n, 4) float32 (front, rear, left, right)"""
+        return self._ultrasonic_history.window(n)
+    
     # ==================== PARSING FUNCTIONS ====================
     
     def _parse_imu_data(self, data: bytes) -> IMUData:
         """Parse IMU data from bytes"""
-        if len(data) != ProtocolConstants.IMU_SIZE:
-            raise ValueError(f"IMU data size mismatch: expected {ProtocolConstants.IMU_SIZE}, got {len(data)}")
+        if len(data) != _IMU_STRUCT.size:
+            raise ValueError(f"IMU data size mismatch: expected {_IMU_STRUCT.size}, got {len(data)}")
         
-        values = struct.unpack('<12f', data)
-        return IMUData(
-            accel_x=values[0], accel_y=values[1], accel_z=values[2],
-            gyro_x=values[3], gyro_y=values[4], gyro_z=values[5],
-            mag_x=values[6], mag_y=values[7], mag_z=values[8],
-            roll=values[9], pitch=values[10], yaw=values[11]
-        )
+        # Field order matches the wire layout, so unpack positionally
+        return IMUData(*_IMU_STRUCT.unpack(data))
     
     def _parse_ultrasonic_data(self, data: bytes) -> UltrasonicData:
         """Parse ultrasonic sensor data"""
-        if len(data) != ProtocolConstants.ULTRASONIC_SIZE:
-            raise ValueError(f"Ultrasonic data size mismatch: expected {ProtocolConstants.ULTRASONIC_SIZE}, got {len(data)}")
+        if len(data) != _ULTRA_STRUCT.size:
+            raise ValueError(f"Ultrasonic data size mismatch: expected {_ULTRA_STRUCT.size}, got {len(data)}")
         
-        values = struct.unpack('<4f', data)
-        return UltrasonicData(
-            front=values[0],
-            rear=values[1],
-            left=values[2],
-            right=values[3]
-        )
+        return UltrasonicData(*_ULTRA_STRUCT.unpack(data))
     
     def _parse_system_status(self, data: bytes) -> SystemStatus:
         """Parse system status"""
-        if len(data) != ProtocolConstants.SYSTEM_STATUS_SIZE:
-            raise ValueError(f"Status data size mismatch: expected {ProtocolConstants.SYSTEM_STATUS_SIZE}, got {len(data)}")
+        if len(data) != _STATUS_STRUCT.size:
+            raise ValueError(f"Status data size mismatch: expected {_STATUS_STRUCT.size}, got {len(data)}")
         
-        values = struct.unpack('<IfBB', data)
-        return SystemStatus(
-            uptime=values[0],
-            battery_voltage=values[1],
-            cpu_load=values[2],
-            errors=values[3]
-        )
+        return SystemStatus(*_STATUS_STRUCT.unpack(data))
     
     # ==================== COMMAND FUNCTIONS ====================
     
     def send_command(self, cmd: int, data: bytes = b'') -> bool:
         """Send command to ATmega32"""
         try:
-            if not self.serial or not self.serial.is_open:
-                logger.error("Serial port not open")
+            if data:
+                packet = _cached_packet(cmd, bytes(data))
+            else:
+                packet = _EMPTY_PACKETS.get(cmd) or Packet.create(cmd)
+        except Exception as e:
+            logger.error(f"Failed to send command: {e}")
+            self.errors += 1
+            return False
+        
+        return self._write_packet(packet)
+    
+    def _write_packet(self, packet: bytes) -> bool:
+        """Queue an already framed packet for the sender thread"""
+        if not self.serial or not self.serial.is_open:
+            logger.error("Serial port not open")
+            return False
+        
+        cmd = packet[1]
+        if cmd == _CMD_MOTOR_EMERGENCY_STOP:
+            return self._send_urgent(packet)
+        
+        state = _STATE_COMMANDS.get(cmd)
+        now = time.monotonic()
+        if state is not None:
+            last = self._last_tx.get(state)
+            if (last is not None and last[0] == packet
+                    and now - last[1] < ProtocolConstants.TX_REFRESH_INTERVAL):
+                self.packets_skipped += 1
+                return True
+        
+        if self.tx_thread and self.tx_thread.is_alive():
+            generation = self._tx_generation
+            try:
+                # Blocks only if the sender is far behind, like a slow write
+                self._tx_queue.put((generation, packet), timeout=ProtocolConstants.TIMEOUT)
+            except queue.Full:
+                logger.error(f"Send queue full, dropping command 0x{cmd:02X}")
+                self.errors += 1
                 return False
             
-            packet = Packet.create(cmd, data)
-            self.serial.write(packet)
-            self.packets_sent += 1
-            logger.debug(f"Sent command 0x{cmd:02X}, {len(data)} bytes")
+            with self._tx_lock:
+                # An emergency stop since the put discards this packet, so
+                # it must not be remembered as sent
+                if generation == self._tx_generation:
+                    self._record_tx(cmd, state, packet, now)
+        else:
+            # Not started yet (or stopped): write from the calling thread
+            with self._tx_lock:
+                if not self._write_now([packet]):
+                    return False
+                self._record_tx(cmd, state, packet, now)
+        
+        return True
+    
+    def _record_tx(self, cmd: int, state: Optional[str], packet: bytes, now: float):
+        """Update _last_tx after a packet was queued or written (caller holds _tx_lock)"""
+        if state is not None:
+            self._last_tx[state] = (packet, now)
+        elif cmd in _STATE_RESET_COMMANDS:
+            self._last_tx.clear()
+    
+    def _send_urgent(self, packet: bytes) -> bool:
+        """Write a packet immediately, discarding commands still queued"""
+        with self._tx_lock:
+            # Queued commands from before this packet must not follow it
+            self._tx_generation += 1
+            ok = self._write_now([packet])
+            self._last_tx.clear()
+        return ok
+    
+    def _write_now(self, packets: List[bytes]) -> bool:
+        """Write framed packets to the port in one go (caller holds _tx_lock)"""
+        data = packets[0] if len(packets) == 1 else b''.join(packets)
+        try:
+            fd = getattr(self.serial, 'fd', None)
+            if fd is None:
+                self.serial.write(data)
+            else:
+                # One raw write() for these short packets; pyserial's write()
+                # (select loop, write timeout) only handles a full TX buffer
+                try:
+                    written = os.write(fd, data)
+                except BlockingIOError:
+                    written = 0
+                if written < len(data):
+                    self.serial.write(data[written:])
+            self.packets_sent += len(packets)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sent %d packet(s), %d bytes", len(packets), len(data))
             return True
         except Exception as e:
             logger.error(f"Failed to send command: {e}")
             self.errors += 1
+            self._last_tx.clear()  # Device state unknown after a failed write
             return False
     
+    def _tx_loop(self):
+        """Sender thread: write queued packets in FIFO order, batching bursts"""
+        while True:
+            item = self._tx_queue.get()
+            if item is None:
+                break
+            
+            # Give commands issued back to back (set_led + set_buzzer + a
+            # request) a moment to land in the same write. The linger is
+            # shorter than one packet's time on the wire at 115200 baud.
+            items = [item]
+            stop = False
+            deadline = time.monotonic() + ProtocolConstants.TX_LINGER
+            while len(items) < ProtocolConstants.TX_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._tx_queue.get(timeout=remaining)
+                    else:
+                        item = self._tx_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+            
+            with self._tx_lock:
+                packets = [packet for generation, packet in items
+                           if generation == self._tx_generation]
+                if packets and self.serial and self.serial.is_open:
+                    self._write_now(packets)
+            
+            if stop:
+                break
+    
+    def _stop_sender(self):
+        """Flush queued commands and stop the sender thread"""
+        if self.tx_thread and self.tx_thread.is_alive():
+            self._tx_queue.put(None)
+            self.tx_thread.join(timeout=2)
+    
     def set_motor_speed(self, left: int, right: int) -> bool:
         """Set motor speeds (-100 to 100)"""
-        left = max(-100, min(100, left))
-        right = max(-100, min(100, right))
+        # Callers may pass controller output as floats; the packet needs whole bytes
+        left = max(-100, min(100, int(round(left))))
+        right = max(-100, min(100, int(round(right))))
         
-        data = struct.pack('<bb', left, right)
-        return self.send_command(CommandCode.CMD_MOTOR_SET_SPEED, data)
+        # Two's complement bytes, same as _MOTOR_STRUCT ('<bb') would give
+        left &= 0xFF
+        right &= 0xFF
+        packet = bytes((ProtocolConstants.START_BYTE, _MOTOR_CMD, 2, left, right,
+                        (_MOTOR_BASE_CHECKSUM + left + right) & 0xFF,
+                        ProtocolConstants.END_BYTE))
+        return self._write_packet(packet)
     
     def stop_motors(self) -> bool:
         """Stop both motors"""
-        return self.send_command(CommandCode.CMD_MOTOR_STOP)
+        return self._write_packet(_PKT_MOTOR_STOP)
     
     def emergency_stop(self) -> bool:
         """Emergency stop (immediate)"""
-        return self.send_command(CommandCode.CMD_MOTOR_EMERGENCY_STOP)
+        return self._write_packet(_PKT_EMERGENCY_STOP)
     
     def request_imu_data(self, timeout: Optional[float] = None) -> Optional[IMUData]:
         """Request IMU data from ATmega32"""
@@ -508,9 +1070,19 @@ class ATmega32Interface:
             self.send_command(CommandCode.CMD_ULTRASONIC_REQUEST)
             return None
     
-    def request_all_sensors(self) -> bool:
-        """Request all sensor data"""
-        return self.send_command(CommandCode.CMD_ALL_SENSORS_REQUEST)
+    def request_all_sensors(self, timeout: Optional[float] = None
+                            ) -> Union[bool, Tuple[IMUData, UltrasonicData], None]:
+        """
+        Request IMU and ultrasonic data in a single frame
+        
+        Without a timeout this returns whether the request was sent. With a
+        timeout it waits and returns (IMUData, UltrasonicData), or None.
+        """
+        if timeout:
+            return self._request_with_timeout(CommandCode.CMD_ALL_SENSORS_REQUEST,
+                                             CommandCode.RESP_ALL_SENSORS_DATA, timeout)
+        else:
+            return self.send_command(CommandCode.CMD_ALL_SENSORS_REQUEST)
     
     def request_system_status(self, timeout: Optional[float] = None) -> Optional[SystemStatus]:
         """Request system status"""
@@ -523,13 +1095,11 @@ class ATmega32Interface:
     
     def set_led(self, state: bool) -> bool:
         """Control LED"""
-        data = bytes([1 if state else 0])
-        return self.send_command(CommandCode.CMD_LED_CONTROL, data)
+        return self._write_packet(_PKT_LED[1 if state else 0])
     
     def set_buzzer(self, state: bool) -> bool:
         """Control buzzer"""
-        data = bytes([1 if state else 0])
-        return self.send_command(CommandCode.CMD_BUZZER_CONTROL, data)
+        return self._write_packet(_PKT_BUZZER[1 if state else 0])
     
     def reset_atmega(self) -> bool:
         """Reset ATmega32"""
@@ -541,44 +1111,83 @@ class ATmega32Interface:
     
     def _request_with_timeout(self, cmd: int, resp_type: int, timeout: float) -> any:
         """Send request and wait for response with timeout"""
-        if resp_type not in self.response_events:
-            self.response_events[resp_type] = threading.Event()
-        
-        event = self.response_events[resp_type]
-        event.clear()
-        self.response_data[resp_type] = None
-        
-        if not self.send_command(cmd):
-            return None
+        # One Future per call, so concurrent requests for the same response
+        # type each get their own answer instead of sharing one slot
+        waiters = self.response_waiters[resp_type]
+        future = Future()
+        waiters.append(future)
         
-        if event.wait(timeout):
-            return self.response_data.get(resp_type)
-        else:
+        try:
+            if not self.send_command(cmd):
+                return None
+            
+            return future.result(timeout)
+        except FutureTimeoutError:
             logger.warning(f"Timeout waiting for response 0x{resp_type:02X}")
             return None
+        finally:
+            if future.cancel():
+                try:
+                    waiters.remove(future)
+                except ValueError:
+                    pass  # Already popped by the read thread
     
     def _signal_response(self, resp_type: int, data: any):
-        """Signal that a response has been received"""
-        if resp_type in self.response_events:
-            self.response_data[resp_type] = data
-            self.response_events[resp_type].set()
+        """Complete the oldest request still waiting for this response type"""
+        waiters = self.response_waiters[resp_type]
+        while waiters:
+            try:
+                future = waiters.popleft()
+            except IndexError:
+                return
+            # False if that request already timed out; try the next one
+            if future.set_running_or_notify_cancel():
+                future.set_result(data)
+                return
     
     def register_callback(self, response_type: int, callback: Callable):
         """Register callback for specific response type"""
+        # Keyed by plain int so the per-packet membership test never goes
+        # through CommandCode
+        response_type = int(response_type)
         if response_type not in self.callbacks:
             self.callbacks[response_type] = []
         self.callbacks[response_type].append(callback)
         logger.info(f"Registered callback for response 0x{response_type:02X}")
     
     def _trigger_callbacks(self, response_type: int, data):
-        """Trigger registered callbacks"""
-        if response_type in self.callbacks:
-            for callback in self.callbacks[response_type]:
+        """Queue registered callbacks so slow ones never stall the read thread"""
+        if response_type not in self.callbacks:
+            return
+        
+        if self._callback_queue.qsize() >= ProtocolConstants.CALLBACK_QUEUE_LIMIT:
+            self.callbacks_dropped += 1
+            if self.callbacks_dropped == 1 or self.callbacks_dropped % 100 == 0:
+                logger.warning(f"Callbacks falling behind, dropped {self.callbacks_dropped} updates")
+            return
+        
+        self._callback_queue.put((response_type, data))
+    
+    def _callback_loop(self):
+        """Run queued callbacks in arrival order"""
+        while True:
+            item = self._callback_queue.get()
+            if item is None:
+                break
+            
+            response_type, data = item
+            for callback in self.callbacks.get(response_type, ()):
                 try:
                     callback(data)
                 except Exception as e:
                     logger.error(f"Error in callback: {e}")
     
+    def _stop_callbacks(self):
+        """Deliver pending callbacks and stop the callback thread"""
+        if self.callback_thread and self.callback_thread.is_alive():
+            self._callback_queue.put(None)
+            self.callback_thread.join(timeout=2)
+    
     def _start_heartbeat(self):
         """Start heartbeat monitoring thread"""
         self.heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
@@ -591,34 +1200,68 @@ class ATmega32Interface:
         timeout_threshold = 15.0
         
         while self.running and self.connected:
-            time.sleep(heartbeat_interval)
+            # Normal traffic doubles as the heartbeat: only ping the ATmega32
+            # after a full window without any received packet
+            self._rx_event.clear()
+            if self._rx_event.wait(timeout_threshold):
+                self._stop_event.wait(heartbeat_interval)
+                continue
             
             time_since_last = time.time() - self.last_heartbeat
+            logger.warning(f"No data received for {time_since_last:.1f}s")
             
-            if time_since_last > timeout_threshold:
-                logger.warning(f"No data received for {time_since_last:.1f}s")
+            if not self.request_system_status(timeout=2.0):
+                logger.error("Heartbeat failed - connection lost")
+                self.connected = False
                 
-                if not self.request_system_status(timeout=2.0):
-                    logger.error("Heartbeat failed - connection lost")
-                    self.connected = False
-                    
-                    if self.auto_reconnect:
-                        logger.info("Attempting to reconnect...")
-                        if self.connect(retries=3):
-                            logger.info("Reconnected successfully")
-                        else:
-                            logger.error("Reconnection failed")
-                            break
+                if self.auto_reconnect:
+                    logger.info("Attempting to reconnect...")
+                    if self.connect(retries=3):
+                        logger.info("Reconnected successfully")
+                    else:
+                        logger.error("Reconnection failed")
+                        break
     
-    def _log_data(self, sensor_type: str, data):
-        """Log sensor data to file"""
+    def _log_data(self, cmd: int, data: bytes):
+        """Log a raw sensor payload to file (see decode_log)"""
         if not self.enable_logging:
             return
         
+        # File I/O happens on the logger thread, keeping the read thread
+        # free of syscalls
+        self._log_queue.put_nowait((time.time(), cmd, data))
+    
+    def _start_logger(self):
+        """Start background thread that writes queued log records"""
+        if self.log_thread and self.log_thread.is_alive():
+            return
+        
+        self.log_thread = threading.Thread(target=self._log_writer_loop, daemon=True)
+        self.log_thread.start()
+        logger.info(f"Logging data to {self.log_file}")
+    
+    def _stop_logger(self):
+        """Flush pending log records and stop the logger thread"""
+        if self.log_thread and self.log_thread.is_alive():
+            self._log_queue.put(None)
+            self.log_thread.join(timeout=2)
+    
+    def _log_writer_loop(self):
+        """Drain the log queue into a file kept open for the whole session"""
         try:
-            with open(self.log_file, 'a') as f:
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-                f.write(f"{timestamp} | {sensor_type} | {data}\n")
+            with open(self.log_file, 'ab', buffering=8192) as f:
+                while True:
+                    record = self._log_queue.get()
+                    if record is None:
+                        break
+                    
+                    ts, cmd, data = record
+                    f.write(_LOG_RECORD.pack(ts, cmd, len(data)))
+                    f.write(data)
+                    
+                    # Flush whenever the queue runs dry so the file stays current
+                    if self._log_queue.empty():
+                        f.flush()
         except Exception as e:
             logger.error(f"Failed to log data: {e}")
     
@@ -628,10 +1271,43 @@ class ATmega32Interface:
             'connected': self.connected,
             'packets_sent': self.packets_sent,
             'packets_received': self.packets_received,
+            'packets_skipped': self.packets_skipped,
             'errors': self.errors,
+            'callbacks_dropped': self.callbacks_dropped,
             'uptime': time.time() - self.last_heartbeat if self.connected else 0
         }
 
+# ==================== LOG DECODING ====================
+
+def decode_log(log_file: str) -> List[Tuple[float, int, object]]:
+    """
+    Decode a binary data log written with enable_logging=True
+    
+    Returns a list of (timestamp, response code, data) where data is the
+    IMUData/UltrasonicData/SystemStatus parsed from the logged payload.
+    """
+    parsers = {
+        CommandCode.RESP_IMU_DATA: (_IMU_STRUCT, IMUData),
+        CommandCode.RESP_ULTRASONIC_DATA: (_ULTRA_STRUCT, UltrasonicData),
+        CommandCode.RESP_SYSTEM_STATUS: (_STATUS_STRUCT, SystemStatus),
+    }
+    
+    raw = Path(log_file).read_bytes()
+    records = []
+    offset = 0
+    while offset + _LOG_RECORD.size <= len(raw):
+        ts, cmd, length = _LOG_RECORD.unpack_from(raw, offset)
+        offset += _LOG_RECORD.size
+        payload = raw[offset:offset + length]
+        offset += length
+        if len(payload) < length:
+            break  # Truncated final record
+        
+        layout, cls = parsers[cmd]
+        records.append((ts, cmd, cls(*layout.unpack(payload))))
+    
+    return records
+
 # ==================== EXAMPLE USAGE ====================
 
 def main():
@@ -20,7 +20,7 @@ import logging
 from cryptography import x509
 from cryptography.x509.oid import NameOID, ExtensionOID
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ec, rsa, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 import secrets
@@ -48,6 +48,7 @@ class SecurityConfig:
     SESSION_KEY_ROTATION = 3600  # 1 hour
     MAX_AUTH_ATTEMPTS = 3
     LOCKOUT_DURATION = 300  # 5 minutes
+    CERT_CACHE_SIZE = 256  # verified peer certificates kept
     
     # V2X Security
     V2X_MESSAGE_TIMEOUT = 5  # seconds
@@ -81,6 +82,49 @@ class SessionKey:
     expires_at: float
     peer_id: str
 
+# ==================== SIGNATURE HELPERS ====================
+
+# New keys are ECDSA P-256: keygen takes milliseconds instead of seconds on
+# the Pi and signing is far cheaper than RSA-2048. RSA keys and certificates
+# already on disk keep working through the RSA branches below.
+_RSA_PSS = padding.PSS(
+    mgf=padding.MGF1(hashes.SHA256()),
+    salt_length=padding.PSS.MAX_LENGTH
+)
+
+def _generate_private_key():
+    """Generate a new ECDSA P-256 private key"""
+    return ec.generate_private_key(ec.SECP256R1(), default_backend())
+
+def _sign_digest(private_key, digest: bytes) -> bytes:
+    """Sign a message digest with the key's scheme (ECDSA or legacy RSA-PSS)"""
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return private_key.sign(digest, _RSA_PSS, hashes.SHA256())
+    return private_key.sign(digest, ec.ECDSA(hashes.SHA256()))
+
+def _verify_digest(public_key, signature: bytes, digest: bytes):
+    """Verify a digest signature, raises InvalidSignature on mismatch"""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        public_key.verify(signature, digest, _RSA_PSS, hashes.SHA256())
+    else:
+        public_key.verify(signature, digest, ec.ECDSA(hashes.SHA256()))
+
+def _verify_cert_signature(issuer_public_key, cert: x509.Certificate):
+    """Check that cert was signed by issuer_public_key, raises on mismatch"""
+    if isinstance(issuer_public_key, rsa.RSAPublicKey):
+        issuer_public_key.verify(
+            cert.signature,
+            cert.tbs_certificate_bytes,
+            padding.PKCS1v15(),
+            cert.signature_hash_algorithm,
+        )
+    else:
+        issuer_public_key.verify(
+            cert.signature,
+            cert.tbs_certificate_bytes,
+            ec.ECDSA(cert.signature_hash_algorithm),
+        )
+
 # ==================== CERTIFICATE MANAGER ====================
 
 class CertificateManager:
@@ -98,7 +142,8 @@ class CertificateManager:
         self.ca_cert = self._load_or_generate_ca()
         self.vehicle_cert, self.vehicle_key = self._load_or_generate_vehicle_cert()
         
-        # Certificate cache
+        # Verified certificates: blake2b(PEM) -> (public key, serial,
+        # not_before, not_after, vehicle ID), least recently used first
         self.cert_cache = {}
         self.revocation_list = set()
         
@@ -123,11 +168,7 @@ class CertificateManager:
     
     def _generate_ca_certificate(self):
         """Generate self-signed CA certificate"""
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        private_key = _generate_private_key()
         
         # Store the CA private key for signing vehicle certificates
         self.ca_private_key = private_key
@@ -190,11 +231,7 @@ class CertificateManager:
     
     def _generate_vehicle_certificate(self):
         """Generate vehicle certificate signed by CA"""
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        private_key = _generate_private_key()
         
         subject = x509.Name([
             x509.NameAttribute(NameOID.COUNTRY_NAME, "EG"),
@@ -237,56 +274,76 @@ class CertificateManager:
     
     def verify_certificate(self, cert_data: bytes) -> bool:
         """Verify certificate against CA"""
+        return self.verify_certificate_cached(cert_data)[0]
+    
+    def verify_certificate_cached(self, cert_data: bytes) -> Tuple[bool, Optional[object], Optional[str]]:
+        """
+        Verify certificate, reusing parse and signature results for known certificates
+        
+        Returns (valid, public_key, vehicle_id). Revocation and the validity
+        period are checked on every call, so a cached certificate that is
+        later revoked or expires is still rejected.
+        """
+        cache_key = hashlib.blake2b(cert_data, digest_size=16).digest()
+        entry = self.cert_cache.pop(cache_key, None)
+        if entry is None:
+            entry = self._parse_and_verify_certificate(cert_data)
+            if entry is None:
+                return False, None, None
+            if len(self.cert_cache) >= self.config.CERT_CACHE_SIZE:
+                del self.cert_cache[next(iter(self.cert_cache))]
+        self.cert_cache[cache_key] = entry  # (Re)insert as most recently used
+        
+        public_key, serial, not_before, not_after, vehicle_id = entry
+        
+        # Check if revoked
+        if serial in self.revocation_list:
+            logger.warning(f"Certificate {serial} is revoked")
+            return False, None, None
+        
+        # Check expiry
+        now = datetime.now(timezone.utc)
+        if now > not_after:
+            logger.warning("Certificate expired")
+            return False, None, None
+        
+        if now < not_before:
+            logger.warning("Certificate not yet valid")
+            return False, None, None
+        
+        return True, public_key, vehicle_id
+    
+    def _parse_and_verify_certificate(self, cert_data: bytes) -> Optional[tuple]:
+        """Parse certificate and check its signature, returns a cert_cache entry or None"""
         try:
             cert = x509.load_pem_x509_certificate(cert_data, default_backend())
             
-            # Check if revoked
-            serial = cert.serial_number
-            if serial in self.revocation_list:
-                logger.warning(f"Certificate {serial} is revoked")
-                return False
-            
-            # Check expiry
-            if datetime.now(timezone.utc) > cert.not_valid_after_utc:
-                logger.warning("Certificate expired")
-                return False
-            
-            if datetime.now(timezone.utc) < cert.not_valid_before_utc:
-                logger.warning("Certificate not yet valid")
-                return False
-            
             # Verify signature (check if self-signed or CA-signed)
             try:
-                ca_public_key = self.ca_cert.public_key()
-                ca_public_key.verify(
-                    cert.signature,
-                    cert.tbs_certificate_bytes,
-                    padding.PKCS1v15(),
-                    cert.signature_hash_algorithm,
-                )
+                _verify_cert_signature(self.ca_cert.public_key(), cert)
                 logger.debug("Certificate verified with CA signature")
             except Exception as sig_error:
                 # If CA verification fails, check if it's self-signed
                 try:
-                    cert_public_key = cert.public_key()
-                    cert_public_key.verify(
-                        cert.signature,
-                        cert.tbs_certificate_bytes,
-                        padding.PKCS1v15(),
-                        cert.signature_hash_algorithm,
-                    )
+                    _verify_cert_signature(cert.public_key(), cert)
                     logger.debug("Self-signed certificate verified")
                 except:
                     logger.error(f"Signature verification failed: {sig_error}")
                     raise
             
-            return True
+            try:
+                vehicle_id = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value
+            except IndexError:
+                vehicle_id = None
+            
+            return (cert.public_key(), cert.serial_number, cert.not_valid_before_utc,
+                    cert.not_valid_after_utc, vehicle_id)
             
         except Exception as e:
             logger.error(f"Certificate verification failed: {e}")
             import traceback
             logger.debug(traceback.format_exc())
-            return False
+            return None
     
     def extract_vehicle_id(self, cert_data: bytes) -> Optional[str]:
         """Extract vehicle ID from certificate"""
@@ -448,14 +505,7 @@ class V2XSecurity:
         digest = hashlib.sha256(message_bytes).digest()
         
         # Sign with vehicle private key
-        signature = self.cert_manager.vehicle_key.sign(
-            digest,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        signature = _sign_digest(self.cert_manager.vehicle_key, digest)
         
         # Attach certificate and signature
         signed_message = message.copy()
@@ -485,33 +535,21 @@ class V2XSecurity:
                 logger.warning("Duplicate message detected (replay attack?)")
                 return False, None
             
-            # Verify certificate
-            if not self.cert_manager.verify_certificate(cert_pem):
+            # Verify certificate (cached per certificate, so repeat senders
+            # skip parsing and the CA signature check)
+            valid, public_key, vehicle_id = self.cert_manager.verify_certificate_cached(cert_pem)
+            if not valid:
                 logger.warning("Invalid certificate")
                 return False, None
             
-            # Extract vehicle ID
-            vehicle_id = self.cert_manager.extract_vehicle_id(cert_pem)
-            
             # Create message digest
             message_copy = {k: v for k, v in signed_message.items() 
                           if k not in ['signature', 'certificate']}
             message_bytes = json.dumps(message_copy, sort_keys=True).encode()
             digest = hashlib.sha256(message_bytes).digest()
             
-            # Load certificate and verify signature
-            cert = x509.load_pem_x509_certificate(cert_pem, default_backend())
-            public_key = cert.public_key()
-            
-            public_key.verify(
-                signature,
-                digest,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            # Verify signature with the certificate's public key
+            _verify_digest(public_key, signature, digest)
             
             # Add nonce to cache
             self.nonce_cache.add(nonce)
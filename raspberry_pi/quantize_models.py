@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+ADAS Model INT8 Quantization
+Statically quantizes the lane / object / traffic sign ONNX models to INT8 (QDQ)
+using a folder of representative camera frames for calibration, or dynamically
+(weights only, no calibration) with --dynamic for models that lose too much
+accuracy under static quantization. --fp16 instead writes FP16 copies (FP32 I/O)
+for the ARMv8.2 FP16 kernels, and --optimize writes graph-optimized *.opt.onnx
+copies so the runtime can skip ORT's optimization passes at startup.
+Run once offline (on the Pi or a dev machine); adas_inference.py and
+adas_inference_optimized.py pick up the resulting *_int8.onnx files automatically.
+Location: ~/Graduation_Project_SDV/raspberry_pi/quantize_models.py
+"""
+
+import argparse
+import glob
+import logging
+import os
+from typing import List, Optional
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                      quantize_dynamic, quantize_static)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('ADAS_Quantize')
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+
+# (model path, input scale) - scales must match the ONNXModel subclasses
+DEFAULT_MODELS = [
+    (os.path.join(MODELS_DIR, 'Lane_Detection', 'enet_sad.onnx'), 1.0),
+    (os.path.join(MODELS_DIR, 'Lane_Detection', 'scnn.onnx'), 1.0),
+    (os.path.join(MODELS_DIR, 'Object_Detection', 'yolov8n.onnx'), 1.0 / 255.0),
+    (os.path.join(MODELS_DIR, 'Traffic_Sign', 'last.onnx'), 1.0 / 255.0),
+]
+
+
+def quantized_path(model_path: str) -> str:
+    """Path of the INT8 model generated for model_path"""
+    return os.path.splitext(model_path)[0] + '_int8.onnx'
+
+
+def fp16_path(model_path: str) -> str:
+    """Path of the FP16 model generated for model_path"""
+    return os.path.splitext(model_path)[0] + '_fp16.onnx'
+
+
+def optimized_path(model_path: str) -> str:
+    """Path of the graph-optimized model generated for model_path"""
+    return os.path.splitext(model_path)[0] + '.opt.onnx'
+
+
+# onnxoptimizer passes applied before ORT's own optimizations
+ONNXOPTIMIZER_PASSES = ['eliminate_identity', 'eliminate_deadend',
+                        'fuse_bn_into_conv', 'fuse_add_bias_into_conv']
+
+
+class FrameCalibrationReader(CalibrationDataReader):
+    """Feeds calibration frames preprocessed exactly like ONNXModel.preprocess"""
+
+    def __init__(self, model_path: str, image_paths: List[str], input_scale: float):
+        session = ort.InferenceSession(model_path, providers=['CPUExecutionProvider'])
+        model_input = session.get_inputs()[0]
+        self.input_name = model_input.name
+
+        shape = model_input.shape
+        height = shape[2] if len(shape) > 2 and isinstance(shape[2], int) else 640
+        width = shape[3] if len(shape) > 3 and isinstance(shape[3], int) else 640
+
+        self._size = (width, height)
+        self._scale = input_scale
+        self._paths = iter(image_paths)
+
+    def get_next(self) -> Optional[dict]:
+        for path in self._paths:
+            image = cv2.imread(path)
+            if image is None:
+                logger.warning(f"Skipping unreadable calibration frame: {path}")
+                continue
+            blob = cv2.dnn.blobFromImage(image, scalefactor=self._scale, size=self._size,
+                                         swapRB=True, crop=False)
+            return {self.input_name: blob}
+        return None
+
+
+def quantize_model(model_path: str, image_paths: List[str], input_scale: float) -> str:
+    """Quantize one model (QDQ, uint8 activations, per-channel int8 weights)"""
+    output_path = quantized_path(model_path)
+    logger.info(f"Quantizing {model_path} with {len(image_paths)} calibration frames...")
+
+    reader = FrameCalibrationReader(model_path, image_paths, input_scale)
+    quantize_static(
+        model_path,
+        output_path,
+        reader,
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+
+    logger.info(f"✓ Saved {output_path}")
+    return output_path
+
+
+def quantize_model_dynamic(model_path: str) -> str:
+    """Quantize one model's weights to per-channel int8; activations are quantized at runtime"""
+    output_path = quantized_path(model_path)
+    logger.info(f"Dynamically quantizing {model_path}...")
+
+    quantize_dynamic(
+        model_path,
+        output_path,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+
+    logger.info(f"✓ Saved {output_path}")
+    return output_path
+
+
+def convert_model_fp16(model_path: str) -> str:
+    """Convert one model's weights and activations to FP16, keeping FP32 inputs/outputs"""
+    import onnx
+    from onnxconverter_common import float16
+
+    output_path = fp16_path(model_path)
+    logger.info(f"Converting {model_path} to FP16...")
+
+    model = float16.convert_float_to_float16(onnx.load(model_path), keep_io_types=True)
+    onnx.save(model, output_path)
+
+    logger.info(f"✓ Saved {output_path}")
+    return output_path
+
+
+def optimize_model(model_path: str) -> str:
+    """Fold/fuse the graph offline and save it for loading with ORT_DISABLE_ALL
+
+    Run this on the target: ORT_ENABLE_ALL output may contain layout
+    transforms specific to the CPU it was produced on.
+    """
+    output_path = optimized_path(model_path)
+    logger.info(f"Optimizing {model_path}...")
+
+    source = model_path
+    try:
+        import onnx
+        import onnxoptimizer
+        model = onnxoptimizer.optimize(onnx.load(model_path), ONNXOPTIMIZER_PASSES)
+        source = model.SerializeToString()
+    except ImportError:
+        logger.warning("onnxoptimizer not installed - applying ORT graph optimizations only")
+
+    # CPU EP only: compiling EPs (e.g. XNNPACK) produce graphs that cannot be serialized
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.optimized_model_filepath = output_path
+    ort.InferenceSession(source, sess_options=sess_options, providers=['CPUExecutionProvider'])
+
+    logger.info(f"✓ Saved {output_path}")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='INT8-quantize the ADAS ONNX models')
+    parser.add_argument('--calib-dir',
+                        help='Folder of representative frames (.jpg/.png), e.g. saved headless output')
+    parser.add_argument('--max-frames', type=int, default=100, help='Maximum calibration frames to use')
+    parser.add_argument('--models', nargs='*', help='Model paths to quantize (default: lane, object, sign)')
+    parser.add_argument('--dynamic', action='store_true',
+                        help='Dynamic (weight-only) quantization; no calibration frames needed. '
+                             'Fallback for segmentation models such as the lane SCNN')
+    parser.add_argument('--fp16', action='store_true',
+                        help='Write FP16 models instead of INT8 (default: object and sign models; '
+                             'the lane models lose accuracy in FP16)')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Write graph-optimized <model>.opt.onnx copies (pass the INT8/FP16 '
+                             'variants via --models to optimize those instead)')
+    args = parser.parse_args()
+
+    if args.optimize:
+        for model_path in args.models or [path for path, _ in DEFAULT_MODELS]:
+            if not os.path.exists(model_path):
+                logger.warning(f"✗ Model not found: {model_path}")
+                continue
+            optimize_model(model_path)
+        return
+
+    if args.fp16:
+        lane_dir = os.path.abspath(os.path.join(MODELS_DIR, 'Lane_Detection'))
+        default = [path for path, _ in DEFAULT_MODELS if not os.path.abspath(path).startswith(lane_dir)]
+        for model_path in args.models or default:
+            if not os.path.exists(model_path):
+                logger.warning(f"✗ Model not found: {model_path}")
+                continue
+            convert_model_fp16(model_path)
+        return
+
+    if args.dynamic:
+        for model_path in args.models or [path for path, _ in DEFAULT_MODELS]:
+            if not os.path.exists(model_path):
+                logger.warning(f"✗ Model not found: {model_path}")
+                continue
+            quantize_model_dynamic(model_path)
+        return
+
+    if not args.calib_dir:
+        parser.error('--calib-dir is required for static quantization')
+
+    image_paths = sorted(glob.glob(os.path.join(args.calib_dir, '*.jpg')) +
+                         glob.glob(os.path.join(args.calib_dir, '*.png')))[:args.max_frames]
+    if not image_paths:
+        logger.error(f"No calibration frames found in {args.calib_dir}")
+        return
+
+    scales = {os.path.abspath(path): scale for path, scale in DEFAULT_MODELS}
+    if args.models:
+        models = [(path, scales.get(os.path.abspath(path), 1.0 / 255.0)) for path in args.models]
+    else:
+        models = DEFAULT_MODELS
+
+    for model_path, input_scale in models:
+        if not os.path.exists(model_path):
+            logger.warning(f"✗ Model not found: {model_path}")
+            continue
+        quantize_model(model_path, image_paths, input_scale)
+
+
+if __name__ == "__main__":
+    main()
@@ -125,7 +125,7 @@ python3 -m pip install --upgrade pip setuptools wheel --break-system-packages
 
 # Core Python packages
 python3 -m pip install --break-system-packages \
-    numpy opencv-python opencv-python-headless pillow onnxruntime \
+    numpy opencv-python opencv-python-headless pillow onnxruntime onnx onnxconverter-common onnxoptimizer \
     pyserial pyusb pynmea2 geopy paho-mqtt firebase-admin google-cloud-firestore google-cloud-storage \
     freenect streamlit plotly pandas matplotlib cryptography pycryptodome flask flask-cors requests psutil
 